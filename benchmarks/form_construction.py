@@ -0,0 +1,93 @@
+"""
+Compares the per request cost of building a create form whose select field
+lists the rows of another table, querying the choices for every form against
+the choices cached by `ModelAdmin.get_form_choices`.
+
+    python benchmarks/form_construction.py
+"""
+import asyncio
+import timeit
+
+import sqlalchemy as sa
+from starlette_core.database import Base, Database, DatabaseURL, Session
+from wtforms import fields
+from wtforms_alchemy import ModelForm
+
+from starlette_admin import ModelAdmin
+
+NUMBER = 2000
+
+db = Database(
+    DatabaseURL("sqlite:///:memory:"), engine_kwargs={"poolclass": sa.pool.StaticPool},
+)
+
+
+class Category(Base):
+    name = sa.Column(sa.String(), nullable=False)
+
+
+class Product(Base):
+    name = sa.Column(sa.String(), nullable=False, unique=True)
+    description = sa.Column(sa.Text(), nullable=True)
+    price = sa.Column(sa.Numeric(10, 2), nullable=True)
+    category_id = sa.Column(sa.Integer, sa.ForeignKey("category.id"))
+
+
+class ProductForm(ModelForm):
+    class Meta:
+        model = Product
+
+    category_id = fields.SelectField(coerce=int)
+
+    @classmethod
+    def get_session(cls):
+        return Session()
+
+
+def get_category_choices():
+    return [(c.id, c.name) for c in Session.query(Category).order_by("name")]
+
+
+class ProductAdmin(ModelAdmin):
+    model_class = Product
+    create_form = ProductForm
+    threadpool_enabled = False
+
+    @classmethod
+    def get_form_choices(cls):
+        return {"category_id": get_category_choices()}
+
+
+def build_uncached():
+    form = ProductAdmin.get_form(ProductForm)
+    form.category_id.choices = get_category_choices()
+    return form
+
+
+def build_cached(loop):
+    form = ProductAdmin.get_form(ProductForm)
+    loop.run_until_complete(ProductAdmin.prepare_form(form, None))
+    return form
+
+
+def main():
+    db.create_all()
+    Session.add_all(Category(name=f"Category {i}") for i in range(100))
+    Session.commit()
+
+    loop = asyncio.new_event_loop()
+    results = {
+        "form only": timeit.timeit(
+            lambda: ProductAdmin.get_form(ProductForm), number=NUMBER
+        ),
+        "choices queried": timeit.timeit(build_uncached, number=NUMBER),
+        "choices cached": timeit.timeit(lambda: build_cached(loop), number=NUMBER),
+    }
+    loop.close()
+
+    for name, total in results.items():
+        print(f"{name:<16} {total / NUMBER * 1e6:8.1f} us per form")
+
+
+if __name__ == "__main__":
+    main()
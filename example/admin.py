@@ -1,6 +1,5 @@
 import json
 
-import sqlalchemy as sa
 from sqlalchemy import orm
 from starlette.exceptions import HTTPException
 from starlette.responses import RedirectResponse
@@ -180,6 +179,7 @@ class DemoModelAdmin(ModelAdmin):
     extra_js_urls = [
         "https://cdnjs.cloudflare.com/ajax/libs/flatpickr/4.6.3/flatpickr.min.js"
     ]
+    search_fields = ["name", "description"]
     create_form = DemoModelForm
     update_form = DemoModelForm
     delete_form = form.Form
@@ -188,15 +188,6 @@ class DemoModelAdmin(ModelAdmin):
     def get_default_ordering(cls, qs: orm.Query) -> orm.Query:
         return qs.order_by("name")
 
-    @classmethod
-    def get_search_results(cls, qs: orm.Query, term: str) -> orm.Query:
-        return qs.filter(
-            sa.or_(
-                DemoModel.name.ilike(f"%{term}%"),
-                DemoModel.description.ilike(f"%{term}%")
-            )
-        )
-
 
 # objects using the model admin - that act as a setting model
 # there is expected to only have a single object in existance.
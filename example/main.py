@@ -1,3 +1,4 @@
+from sqlalchemy.pool import StaticPool
 from starlette.applications import Starlette
 from starlette.authentication import AuthCredentials, AuthenticationBackend, SimpleUser
 from starlette.middleware.authentication import AuthenticationMiddleware
@@ -20,7 +21,15 @@ DEBUG = True
 
 url = DatabaseURL("sqlite:///:memory:")
 
-db = Database(url)
+# the model admin runs queries in a thread pool, so the in memory database
+# must share a single connection across threads
+db = Database(
+    url,
+    engine_kwargs={
+        "connect_args": {"check_same_thread": False},
+        "poolclass": StaticPool,
+    },
+)
 db.create_all()
 
 # create an admin site
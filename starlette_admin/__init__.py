@@ -1,8 +1,8 @@
 __version__ = "0.0.1"
 
 
-from .admin import BaseAdmin, ModelAdmin
+from .admin import AsyncModelAdmin, BaseAdmin, ModelAdmin
 from .config import config
 from .site import AdminSite
 
-__all__ = ["AdminSite", "config", "BaseAdmin", "ModelAdmin"]
+__all__ = ["AdminSite", "config", "AsyncModelAdmin", "BaseAdmin", "ModelAdmin"]
@@ -0,0 +1,33 @@
+import argparse
+import typing
+
+from .templating import configure_templates, get_bytecode_cache, precompile_templates
+
+
+def compile_templates(args: argparse.Namespace) -> None:
+    configure_templates(bytecode_cache=get_bytecode_cache(args.directory))
+    names = precompile_templates(prefix=args.prefix)
+    print(f"Compiled {len(names)} templates into {args.directory}")
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m starlette_admin")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parser_compile = commands.add_parser(
+        "compile-templates",
+        help=(
+            "compile the starlette_admin templates into a bytecode cache "
+            "directory, ie when building an image"
+        ),
+    )
+    parser_compile.add_argument("directory", help="the bytecode cache directory")
+    parser_compile.add_argument("--prefix", default="starlette_admin/")
+    parser_compile.set_defaults(func=compile_templates)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":  # pragma: nocover
+    main()
@@ -0,0 +1,88 @@
+import typing
+
+
+class BulkSelection(typing.NamedTuple):
+    """
+    The objects selected in the list view, either the `ids` ticked or, when
+    `all_matching = True`, every object matching the current search and
+    filters.
+    """
+
+    ids: typing.List[str]
+    all_matching: bool
+
+
+class BulkResult(typing.NamedTuple):
+    total: int
+    failed_ids: list
+
+
+class BulkAction:
+    """
+    The base class for actions run on the objects selected in the list
+    view, registered on an admin in `bulk_actions`.
+    """
+
+    label: str = ""
+    confirm: str = ""
+
+    def __init__(
+        self, label: typing.Optional[str] = None, confirm: typing.Optional[str] = None
+    ) -> None:
+        if label is not None:
+            self.label = label
+        if confirm is not None:
+            self.confirm = confirm
+
+    async def run(self, admin, request, selection: BulkSelection) -> BulkResult:
+        raise NotImplementedError()
+
+    def get_message(self, result: BulkResult) -> typing.Tuple[str, str]:
+        """ Return the (message, category) shown once the action is complete. """
+
+        plural = "s" if result.total != 1 else ""
+        if result.failed_ids:
+            failed = ", ".join(str(id) for id in result.failed_ids)
+            return (
+                f"{self.label}: {result.total} record{plural} updated, "
+                f"could not update {failed}",
+                "error",
+            )
+        return f"{self.label}: {result.total} record{plural} updated", "success"
+
+
+class BulkDelete(BulkAction):
+    """ Deletes the selected objects using the admin's `do_bulk_delete`. """
+
+    label = "Delete"
+    confirm = "Are you sure you want to delete the selected records?"
+
+    async def run(self, admin, request, selection: BulkSelection) -> BulkResult:
+        return await admin.do_bulk_delete(request, selection)
+
+    def get_message(self, result: BulkResult) -> typing.Tuple[str, str]:
+        plural = "s" if result.total != 1 else ""
+        if result.failed_ids:
+            failed = ", ".join(str(id) for id in result.failed_ids)
+            return (
+                f"Deleted {result.total} record{plural}, {failed} could not be "
+                "deleted due to being referenced by a related object",
+                "error",
+            )
+        return f"Deleted {result.total} record{plural}", "success"
+
+
+class BulkUpdate(BulkAction):
+    """
+    Sets the values on the selected objects using the admin's
+    `do_bulk_update`, ie `BulkUpdate("Publish", {"published": True})`.
+    """
+
+    def __init__(
+        self, label: str, values: dict, confirm: typing.Optional[str] = None
+    ) -> None:
+        super().__init__(label, confirm)
+        self.values = values
+
+    async def run(self, admin, request, selection: BulkSelection) -> BulkResult:
+        return await admin.do_bulk_update(request, selection, self.values)
@@ -1,2 +1,3 @@
+from .async_model_admin import AsyncModelAdmin
 from .base import BaseAdmin
 from .model_admin import ModelAdmin
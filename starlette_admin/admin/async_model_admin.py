@@ -0,0 +1,286 @@
+import typing
+
+import sqlalchemy as sa
+from sqlalchemy.exc import IntegrityError
+from starlette.exceptions import HTTPException
+from starlette_core.paginator import InvalidPage
+
+from ..actions import BulkResult, BulkSelection
+from ..exceptions import ConflictError
+from ..paginator import AsyncQueryPaginator
+from .model_admin import ModelAdmin
+
+if typing.TYPE_CHECKING:  # pragma: nocover
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class AsyncModelAdmin(ModelAdmin):
+    """
+    The base admin class for sqlalchemy crud operations using an
+    `AsyncSession`, all database work is awaited rather than run in threads.
+    """
+
+    paginator_class = AsyncQueryPaginator  # type: ignore
+    threadpool_enabled = False
+
+    @classmethod
+    def get_session(cls) -> "AsyncSession":
+        """
+        Return a new `AsyncSession`, it is used as a context manager so is
+        closed once each hook is complete. Objects are used after the session
+        is closed so it should be created with `expire_on_commit=False`.
+
+        Example:
+            async_session = sessionmaker(
+                engine, class_=AsyncSession, expire_on_commit=False
+            )
+
+            @classmethod
+            def get_session(cls):
+                return async_session()
+        """
+        raise NotImplementedError()
+
+    @classmethod
+    async def get_queryset(cls) -> sa.sql.Select:  # type: ignore
+        return sa.select(cls.model_class)
+
+    @classmethod
+    async def get_list_objects(cls, request) -> sa.sql.Select:  # type: ignore
+        qs = cls.filter_queryset(await cls.get_queryset(), request)
+        return qs.options(*cls.get_list_options(request))
+
+    @classmethod
+    async def evaluate_list_objects(cls, objects) -> list:  # type: ignore
+        async with cls.get_session() as session:
+            result = await session.execute(objects)
+            return result.scalars().all()
+
+    @classmethod
+    async def get_list_filters(cls, request) -> typing.List[dict]:  # type: ignore
+        list_filters = []
+        key = cls.get_count_key(request)
+        for list_filter in cls.list_filters:
+            rows = list_filter.cache.get(key)
+            if rows is None:
+                qs = await cls.get_queryset()
+                stmt = cls.get_facet_query(qs, request, list_filter)
+                async with cls.get_session() as session:
+                    rows = [tuple(row) for row in await session.execute(stmt)]
+                list_filter.cache.set(key, rows)
+            value = list_filter.get_value(request, cls.model_class)
+            list_filters.append(
+                {
+                    "filter": list_filter,
+                    "value": value,
+                    "choices": list_filter.get_choices(rows, value),
+                }
+            )
+        return list_filters
+
+    @classmethod
+    async def get_export_objects(cls, request) -> sa.sql.Select:  # type: ignore
+        qs = cls.filter_queryset(await cls.get_queryset(), request)
+        return qs.options(*cls.get_export_options())
+
+    @classmethod
+    async def export_rows(cls, request, objects) -> typing.AsyncIterator[list]:
+        field_names = cls.get_export_field_names()
+
+        async with cls.get_session() as session:
+            result = await session.stream(objects)
+            async for objs in result.scalars().partitions(cls.export_batch_size):
+                yield [
+                    [cls.get_field_value(obj, name) for name in field_names]
+                    for obj in objs
+                ]
+
+    @classmethod
+    async def do_bulk_delete(cls, request, selection: BulkSelection) -> BulkResult:
+        qs = await cls.get_queryset()
+        criteria = cls.get_bulk_criteria(qs, request, selection)  # type: ignore
+        return await cls.execute_bulk(sa.delete(cls.model_class), criteria)
+
+    @classmethod
+    async def do_bulk_update(
+        cls, request, selection: BulkSelection, values: dict
+    ) -> BulkResult:
+        qs = await cls.get_queryset()
+        criteria = cls.get_bulk_criteria(qs, request, selection)  # type: ignore
+        stmt = sa.update(cls.model_class).values(cls.get_bulk_update_values(values))
+        return await cls.execute_bulk(stmt, criteria)
+
+    @classmethod
+    async def execute_bulk(cls, stmt, criteria: list) -> BulkResult:  # type: ignore
+        stmt = stmt.execution_options(synchronize_session=False)
+
+        async with cls.get_session() as session:
+            try:
+                result = await session.execute(stmt.where(*criteria))
+                await session.commit()
+                return BulkResult(result.rowcount, [])
+            except IntegrityError:
+                await session.rollback()
+
+            ids = await session.execute(sa.select(cls.model_class.id).where(*criteria))
+            count, failed_ids = 0, []
+            for id in ids.scalars().all():
+                try:
+                    async with session.begin_nested():
+                        await session.execute(stmt.where(cls.model_class.id == id))
+                    count += 1
+                except IntegrityError:
+                    failed_ids.append(id)
+            await session.commit()
+            return BulkResult(count, failed_ids)
+
+    @classmethod
+    async def paginate(cls, request, objects):  # type: ignore
+        if cls.pagination_mode == "keyset":
+            return await cls.paginate_keyset(request, objects)
+
+        page_number = request.query_params.get("page")
+
+        try:
+            page_number = int(page_number)
+        except (TypeError, ValueError):
+            page_number = 1
+
+        async with cls.get_session() as session:
+            paginator = cls.paginator_class(objects, cls.paginate_by, session=session)
+            try:
+                page = await paginator.fetch_page(page_number)
+                return (paginator, page, page.object_list, page.has_other_pages)
+            except InvalidPage as e:
+                raise HTTPException(404, f"Invalid page {page_number}: {str(e)}")
+
+    @classmethod
+    async def paginate_keyset(cls, request, objects):  # type: ignore
+        paginator = cls.get_keyset_paginator(request, objects)
+
+        try:
+            stmt, forwards, seeking = paginator.get_page_query(
+                after=request.query_params.get("after"),
+                before=request.query_params.get("before"),
+            )
+        except InvalidPage as e:
+            raise HTTPException(404, f"Invalid page: {str(e)}")
+
+        async with cls.get_session() as session:
+            result = await session.execute(stmt)
+            page = paginator.build_page(result.scalars().all(), forwards, seeking)
+
+        return (paginator, page, page.object_list, page.has_other_pages)
+
+    @classmethod
+    async def get_list_validator(cls, request):  # type: ignore
+        if not (cls.version_column or cls.timestamp_column):
+            return None
+        stmt = cls.get_list_validator_query(await cls.get_queryset(), request)
+        async with cls.get_session() as session:
+            return tuple((await session.execute(stmt)).one())
+
+    @classmethod
+    async def get_object_validator(cls, request):  # type: ignore
+        if not (cls.version_column or cls.timestamp_column):
+            return None
+        async with cls.get_session() as session:
+            return await session.scalar(cls.get_object_validator_query(request))
+
+    @classmethod
+    async def get_lookup_results(cls, request):  # type: ignore
+        stmt = cls.get_lookup_query(await cls.get_queryset(), request)  # type: ignore
+        async with cls.get_session() as session:
+            objects = (await session.execute(stmt)).scalars().all()
+        return objects[: cls.lookup_page_size], len(objects) > cls.lookup_page_size
+
+    @classmethod
+    async def get_lookup_objects(cls, request, ids):  # type: ignore
+        qs = await cls.get_queryset()
+        stmt = qs.filter(cls.model_class.id.in_(cls.get_lookup_ids(ids)))
+        async with cls.get_session() as session:
+            return (await session.execute(stmt)).scalars().all()
+
+    @classmethod
+    async def get_object(cls, request):
+        id = request.path_params["id"]
+        stmt = (await cls.get_queryset()).filter(cls.model_class.id == id)
+
+        async with cls.get_session() as session:
+            result = await session.execute(stmt)
+            instance = result.scalars().first()
+
+        if instance is None:
+            raise HTTPException(404)
+        return instance
+
+    @classmethod
+    async def do_create(cls, form, request):
+        instance = cls.create_instance(form, request)
+
+        async with cls.get_session() as session:
+            session.add(instance)
+            await session.commit()
+
+        return instance
+
+    @classmethod
+    async def do_delete(cls, instance, form, request):
+        async with cls.get_session() as session:
+            await session.delete(instance)
+            await session.commit()
+
+    @classmethod
+    async def do_import_batch(cls, forms: list, request) -> list:
+        # an overridden `do_create` is called for each row so it isn't skipped
+        if cls.do_create.__func__ is not AsyncModelAdmin.do_create.__func__:  # type: ignore
+            return await super().do_import_batch(forms, request)
+
+        instances = [(line, cls.create_instance(form, request)) for line, form in forms]
+
+        async with cls.get_session() as session:
+            try:
+                session.add_all([instance for _, instance in instances])
+                await session.commit()
+                return []
+            except IntegrityError:
+                await session.rollback()
+
+            errors = []
+            for line, instance in instances:
+                try:
+                    async with session.begin_nested():
+                        session.add(instance)
+                except IntegrityError as e:
+                    errors.append((line, str(e.orig)))
+            await session.commit()
+            return errors
+
+    @classmethod
+    async def do_update(cls, instance, form, request):
+        form.populate_obj(instance)
+        changes = cls.get_changes(instance)
+        if changes:
+            await cls.save_update(instance, request)
+        await cls.on_update(instance, changes, request)
+        return instance
+
+    @classmethod
+    async def save_update(cls, instance, request) -> None:
+        version = None
+        if cls.version_column:
+            version = await cls.get_submitted_version(instance, request)
+
+        async with cls.get_session() as session:
+            if cls.version_column:
+                try:
+                    await session.run_sync(
+                        lambda sync_session: cls.apply_versioned_update(
+                            sync_session, instance, version
+                        )
+                    )
+                except ConflictError:
+                    await session.rollback()
+                    raise
+            session.add(instance)
+            await session.commit()
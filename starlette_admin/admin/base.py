@@ -1,17 +1,36 @@
+import asyncio
+import hashlib
+import itertools
 import typing
 
 from sqlalchemy.exc import IntegrityError
 from starlette.authentication import has_required_scope
+from starlette.datastructures import QueryParams, UploadFile
 from starlette.exceptions import HTTPException
-from starlette.responses import RedirectResponse
+from starlette.responses import (
+    JSONResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
 from starlette.routing import Route, Router
 from starlette_core.messages import message
 from starlette_core.paginator import InvalidPage, Paginator
 from wtforms.form import Form
 
+from .. import __version__
+from ..actions import BulkAction, BulkResult, BulkSelection
+from ..cache import TTLCache
 from ..config import config
-from ..exceptions import MissingFormError
+from ..exceptions import ConflictError, MissingFormError
+from ..exporters import CSVExporter, Exporter, NDJSONExporter
+from ..filters import ListFilter
+from ..forms.fields import AutocompleteField
+from ..importers import CSVImporter, Importer, NDJSONImporter
+from ..paginator import ListKeysetPaginator
+from ..rows import RowRenderer
 from ..site import AdminSite
+from ..templating import StreamingTemplateResponse, get_templates_digest
 
 
 class BaseAdmin:
@@ -22,19 +41,50 @@ class BaseAdmin:
     collection_name: str = ""
     # list view options
     list_field_names: typing.Sequence[str] = []
+    list_formatters: typing.Dict[str, typing.Callable[[typing.Any], typing.Any]] = {}
     paginate_by: typing.Optional[int] = None
-    paginator_class = Paginator
+    paginator_class: typing.Type[Paginator] = Paginator
+    pagination_mode: str = "offset"
     search_enabled: bool = False
     order_enabled: bool = False
+    list_filters: typing.Sequence[ListFilter] = []
+    bulk_actions: typing.Dict[str, BulkAction] = {}
+    # export options
+    export_enabled: bool = False
+    export_field_names: typing.Sequence[str] = []
+    export_formats: typing.Dict[str, Exporter] = {
+        "csv": CSVExporter(),
+        "ndjson": NDJSONExporter(),
+    }
+    export_batch_size: int = 1000
+    # import options
+    import_enabled: bool = False
+    import_formats: typing.Dict[str, Importer] = {
+        "csv": CSVImporter(),
+        "ndjson": NDJSONImporter(),
+    }
+    import_batch_size: int = 500
+    import_max_errors: int = 100
+    # lookups used by `AutocompleteField`
+    lookup_enabled: bool = False
+    lookup_page_size: int = 20
+    # concurrency
+    threadpool_enabled: bool = False
     # routing
     routing_id_part: str = "{id:int}"
+    # http caching
+    cache_control: str = "private, no-cache"
     # permissions
     permission_scopes: typing.Sequence[str] = []
     # templating
     create_template: str = "starlette_admin/create.html"
     delete_template: str = "starlette_admin/delete.html"
+    import_template: str = "starlette_admin/import.html"
     list_template: str = "starlette_admin/list.html"
+    list_fragment_template: str = "starlette_admin/partials/list_results.html"
     update_template: str = "starlette_admin/update.html"
+    # when `True` the list view is sent as it is rendered
+    list_streaming_enabled: bool = False
     # static includes
     extra_css_urls: typing.List[str] = []
     extra_js_urls: typing.List[str] = []
@@ -42,9 +92,17 @@ class BaseAdmin:
     create_form: Form
     delete_form: Form
     update_form: Form
+    # the name of the hidden input holding the version of the object updated
+    version_field_name: str = "_version"
+    # the seconds to cache `get_form_choices` for, `None` until invalidated
+    form_choices_ttl: typing.Optional[float] = None
 
     # will be set via `AdminSite.register`
     site: AdminSite
+    # will be set via `get_row_renderer`
+    _row_renderer: RowRenderer
+    # will be set via `get_form_choices_cache`
+    _form_choices_cache: TTLCache
 
     @classmethod
     def get_context(cls, request):
@@ -56,10 +114,38 @@ class BaseAdmin:
                 "url_names": cls.url_names(),
                 "extra_css_urls": cls.extra_css_urls,
                 "extra_js_urls": cls.extra_js_urls,
+                "export_enabled": cls.export_enabled,
+                "export_formats": cls.export_formats,
+                "import_enabled": cls.import_enabled,
+                "bulk_actions": cls.bulk_actions,
             }
         )
         return context
 
+    @classmethod
+    async def run_sync(cls, func, *args, **kwargs):
+        """
+        Run a blocking function from within the async views. When
+        `cls.threadpool_enabled = True` it is run in the site's thread pool
+        so it does not block the event loop, otherwise it is called directly.
+        """
+
+        if cls.threadpool_enabled:
+            return await cls.site.run_in_threadpool(func, *args, **kwargs)
+        return func(*args, **kwargs)
+
+    @classmethod
+    async def run_hook(cls, func, *args, **kwargs):
+        """
+        Call one of the admin hooks such as `get_list_objects` or `get_object`,
+        awaiting it when it is a coroutine function, otherwise it is run
+        using `cls.run_sync`.
+        """
+
+        if asyncio.iscoroutinefunction(func):
+            return await func(*args, **kwargs)
+        return await cls.run_sync(func, *args, **kwargs)
+
     @classmethod
     def get_list_objects(cls, request):
         """
@@ -80,9 +166,180 @@ class BaseAdmin:
         the filtered list of objects using the `request.query_param`
         `search`.
 
+        Any sliceable sequence can be returned, it will be paginated using
+        `cls.paginator_class` when `cls.paginate_by` is set.
+
         """
         raise NotImplementedError()
 
+    @classmethod
+    def evaluate_list_objects(cls, objects) -> list:
+        """
+        Return the objects from `get_list_objects` as a list, used when the
+        list view is not paginated.
+        """
+
+        return list(objects)
+
+    @classmethod
+    def get_list_filters(cls, request) -> typing.List[dict]:
+        """
+        Return the `cls.list_filters` to render alongside the list view as
+        a list of dicts with the `filter`, its active `value` and `choices`.
+
+        Filters are applied in the database so are only supported by the
+        `ModelAdmin`, by default an empty list is returned.
+        """
+
+        return []
+
+    @classmethod
+    def get_field_value(cls, obj, name: str):
+        """
+        Return the value of the field `name` from the object, used to render
+        `list_field_names`. Names can contain dots to follow attributes of
+        related objects, ie `customer.name`.
+        """
+
+        value = obj
+        for part in name.split("."):
+            if value is None:
+                return None
+            try:
+                value = value[part]
+            except (TypeError, LookupError, AttributeError):
+                value = getattr(value, part, None)
+        return value
+
+    @classmethod
+    def is_fragment_request(cls, request) -> bool:
+        """
+        Return `True` when only the list results should be rendered rather
+        than the whole page, requested with the `X-Fragment` header or the
+        `_fragment` query param.
+        """
+
+        return "x-fragment" in request.headers or "_fragment" in request.query_params
+
+    @classmethod
+    def get_list_validator(cls, request) -> typing.Optional[typing.Hashable]:
+        """
+        Return a cheap value that changes whenever the list view would, ie
+        the count and latest update time of the rows. When set the list view
+        answers a matching `If-None-Match` with a 304 before any rendering,
+        `None` disables this.
+        """
+
+        return None
+
+    @classmethod
+    def get_object_validator(cls, request) -> typing.Optional[typing.Hashable]:
+        """
+        Return a cheap value that changes whenever the object of the edit
+        view does, ie its version. `None` disables caching the edit view.
+        """
+
+        return None
+
+    @classmethod
+    def get_etag(cls, request, validator) -> typing.Optional[str]:
+        """
+        Return the ETag of a page from its validator. The user and their
+        permissions are included as the page differs for them. Pages with
+        messages waiting to be shown are never cached.
+        """
+
+        if validator is None:
+            return None
+        if "session" in request.scope and request.session.get("_messages"):
+            return None
+
+        user, scopes = "", []
+        if "user" in request.scope:
+            user = getattr(request.user, "id", None) or request.user.display_name
+        if "auth" in request.scope:
+            scopes = sorted(request.auth.scopes)
+
+        fragment = cls.is_fragment_request(request)
+        version = cls.get_etag_version()
+        key = repr((validator, user, scopes, fragment, cls.site.name, version))
+        return 'W/"%s"' % hashlib.sha1(key.encode()).hexdigest()
+
+    @classmethod
+    def get_etag_version(cls) -> typing.Hashable:
+        """
+        Return what, other than the data, changes how the pages render so
+        pages cached before a deploy are not reused: `config.version`, the
+        package version, the templates and the list settings.
+        """
+
+        formatters = sorted(
+            (name, getattr(formatter, "__qualname__", repr(formatter)))
+            for name, formatter in cls.list_formatters.items()
+        )
+        return (
+            config.version,
+            __version__,
+            get_templates_digest(),
+            cls.list_template,
+            cls.list_fragment_template,
+            cls.update_template,
+            tuple(cls.list_field_names),
+            tuple(formatters),
+            cls.paginate_by,
+            cls.pagination_mode,
+        )
+
+    @classmethod
+    def get_cache_headers(cls, etag: str) -> typing.Dict[str, str]:
+        return {
+            "ETag": etag,
+            "Cache-Control": cls.cache_control,
+            "Vary": "Cookie, Authorization, X-Fragment",
+        }
+
+    @classmethod
+    def is_not_modified(cls, request, etag: str) -> bool:
+        """ Return `True` if the request's `If-None-Match` includes the ETag. """
+
+        if_none_match = request.headers.get("if-none-match")
+        if not if_none_match:
+            return False
+        # weak comparison, ignoring the W/ prefix
+        tags = {cls.strip_weak(tag.strip()) for tag in if_none_match.split(",")}
+        return "*" in tags or cls.strip_weak(etag) in tags
+
+    @classmethod
+    def strip_weak(cls, tag: str) -> str:
+        return tag[2:] if tag.startswith("W/") else tag
+
+    @classmethod
+    def not_modified_response(cls, etag: str) -> Response:
+        return Response(status_code=304, headers=cls.get_cache_headers(etag))
+
+    @classmethod
+    def get_row_renderer(cls) -> RowRenderer:
+        """
+        Return the renderer of the list table rows, built once per admin from
+        `cls.list_field_names` and `cls.list_formatters`.
+        """
+
+        renderer = cls.__dict__.get("_row_renderer")
+        if (
+            renderer is None
+            or renderer.field_names != tuple(cls.list_field_names)
+            or renderer.formatters != cls.list_formatters
+        ):
+            # an overridden `get_field_value` is used in place of the accessors
+            overridden = any(
+                "get_field_value" in vars(klass)
+                for klass in cls.__mro__[: cls.__mro__.index(BaseAdmin)]
+            )
+            get_value = cls.get_field_value if overridden else None
+            renderer = RowRenderer(cls.list_field_names, cls.list_formatters, get_value)
+            cls._row_renderer = renderer
+        return renderer
+
     @classmethod
     def get_object(cls, request):
         raise NotImplementedError()
@@ -99,9 +356,16 @@ class BaseAdmin:
     async def do_update(cls, instance, form, request):
         raise NotImplementedError()
 
+    @classmethod
+    def get_paginator(cls, request, objects):
+        return cls.paginator_class(objects, cls.paginate_by)
+
     @classmethod
     def paginate(cls, request, objects):
-        paginator = cls.paginator_class(objects, cls.paginate_by)
+        if cls.pagination_mode == "keyset":
+            return cls.paginate_keyset(request, objects)
+
+        paginator = cls.get_paginator(request, objects)
         page_number = request.query_params.get("page")
 
         try:
@@ -115,36 +379,369 @@ class BaseAdmin:
         except InvalidPage as e:
             raise HTTPException(404, f"Invalid page {page_number}: {str(e)}")
 
+    @classmethod
+    def paginate_keyset(cls, request, objects):
+        """
+        Paginate the objects using the `after` and `before` cursors in
+        the request.query_params, used when `cls.pagination_mode = "keyset"`.
+
+        Returns a tuple of (paginator, page, object_list, is_paginated) where
+        the page has `next_cursor` and `previous_cursor` attributes.
+        """
+
+        paginator = cls.get_keyset_paginator(request, objects)
+
+        try:
+            page = paginator.page(
+                after=request.query_params.get("after"),
+                before=request.query_params.get("before"),
+            )
+            return (paginator, page, page.object_list, page.has_other_pages)
+        except InvalidPage as e:
+            raise HTTPException(404, f"Invalid page: {str(e)}")
+
+    @classmethod
+    def get_keyset_paginator(cls, request, objects):
+        """
+        Return the paginator used when `cls.pagination_mode = "keyset"`, the
+        objects are paged in the order they are returned by
+        `cls.get_list_objects`.
+        """
+
+        return ListKeysetPaginator(
+            list(objects),
+            cls.paginate_by,
+            get_id=lambda obj: cls.get_field_value(obj, "id"),
+        )
+
+    @classmethod
+    def get_bulk_objects(cls, request, selection: BulkSelection) -> list:
+        """
+        Return the objects a bulk action is run on, the list objects
+        filtered to the selected ids unless `selection.all_matching`.
+        """
+
+        objects = cls.get_list_objects(request)
+        if selection.all_matching:
+            return list(objects)
+        return [
+            obj
+            for obj in objects
+            if str(cls.get_field_value(obj, "id")) in selection.ids
+        ]
+
+    @classmethod
+    async def do_bulk_delete(cls, request, selection: BulkSelection) -> BulkResult:
+        """
+        Delete the selected objects, by default `cls.do_delete` is called
+        for each. Returns the number deleted and the ids that could not be.
+        """
+
+        count, failed_ids = 0, []
+        for obj in await cls.run_hook(cls.get_bulk_objects, request, selection):
+            try:
+                await cls.do_delete(obj, None, request)
+                count += 1
+            except IntegrityError:
+                failed_ids.append(cls.get_field_value(obj, "id"))
+        return BulkResult(count, failed_ids)
+
+    @classmethod
+    async def do_bulk_update(
+        cls, request, selection: BulkSelection, values: dict
+    ) -> BulkResult:
+        """ Set the values on the selected objects. """
+        raise NotImplementedError()
+
+    @classmethod
+    def get_export_field_names(cls) -> typing.Sequence[str]:
+        return cls.export_field_names or cls.list_field_names
+
+    @classmethod
+    def get_export_objects(cls, request):
+        """
+        Return the objects to export, by default the same objects as the
+        list view including any search, filters and ordering.
+        """
+
+        return cls.get_list_objects(request)
+
+    @classmethod
+    async def export_rows(cls, request, objects) -> typing.AsyncIterator[list]:
+        """
+        Yield batches of up to `cls.export_batch_size` rows, each a list of
+        the values of the export fields. Objects are iterated in the thread
+        pool one batch at a time so they never need to all be in memory.
+        """
+
+        field_names = cls.get_export_field_names()
+        iterator = iter(objects)
+
+        def next_batch():
+            return [
+                [cls.get_field_value(obj, name) for name in field_names]
+                for obj in itertools.islice(iterator, cls.export_batch_size)
+            ]
+
+        while True:
+            rows = await cls.run_sync(next_batch)
+            if not rows:
+                break
+            yield rows
+
+    @classmethod
+    def get_import_forms(
+        cls, rows: typing.Iterator, importer: Importer
+    ) -> typing.Tuple[int, list, list]:
+        """
+        Read up to `cls.import_batch_size` rows into `cls.create_form`s.
+        Returns a tuple of (rows read, [(line, form)] of rows to validate,
+        [(line, error)] of rows that could not be read).
+        """
+
+        # loaded by the import view
+        choices = cls.get_form_choices_cache().get("choices") or {}
+
+        count, forms, errors = 0, [], []
+        for row in itertools.islice(rows, cls.import_batch_size):
+            count += 1
+            if row.error:
+                errors.append((row.line, row.error))
+                continue
+            form = cls.get_form(
+                cls.create_form, formdata=importer.get_formdata(row.data)
+            )
+            cls.apply_form_choices(form, choices)
+            forms.append((row.line, form))
+        return count, forms, errors
+
+    @classmethod
+    def validate_import_forms(cls, forms: list) -> typing.Tuple[list, list]:
+        """
+        Validate the (line, form) of a batch of rows. Returns a tuple of
+        ([(line, form)] of valid rows, [(line, error)] of invalid rows).
+        """
+
+        valid, errors = [], []
+        for line, form in forms:
+            if form.validate():
+                valid.append((line, form))
+            else:
+                errors.append((line, cls.format_form_errors(form)))
+        return valid, errors
+
+    @classmethod
+    def format_form_errors(cls, form: Form) -> str:
+        return "; ".join(
+            f"{name}: {' '.join(str(e) for e in field_errors)}"
+            for name, field_errors in form.errors.items()
+        )
+
+    @classmethod
+    async def do_import_batch(cls, forms: list, request) -> list:
+        """
+        Create an object from each valid form in the batch, a list of
+        (line, form). Returns a list of (line, error) for rows that could
+        not be saved. By default `cls.do_create` is called for each form.
+        """
+
+        errors = []
+        for line, form in forms:
+            try:
+                await cls.do_create(form, request)
+            except IntegrityError:
+                errors.append((line, "Could not be saved due to a conflict"))
+        return errors
+
     @classmethod
     def get_form(cls, form_cls: Form, **kwargs: typing.Any):
         return form_cls(**kwargs)
 
+    @classmethod
+    def get_object_version(cls, instance) -> typing.Any:
+        """
+        Return the version of the object, sent with the update form so
+        `cls.do_update` can tell if the object changed since the form was
+        loaded. `None` when the object is not versioned.
+        """
+
+        return None
+
+    @classmethod
+    def get_form_choices(cls) -> typing.Dict[str, list]:
+        """
+        Return the choices of the select fields of the forms by field name,
+        ie loaded from the database. They are loaded once and used by every
+        form until `cls.invalidate_form_choices` is called or
+        `cls.form_choices_ttl` seconds have passed.
+        """
+
+        return {}
+
+    @classmethod
+    def get_form_choices_cache(cls) -> TTLCache:
+        cache = cls.__dict__.get("_form_choices_cache")
+        if cache is None:
+            ttl = cls.form_choices_ttl
+            cache = TTLCache(ttl=float("inf") if ttl is None else ttl, maxsize=1)
+            cls._form_choices_cache = cache
+        return cache
+
+    @classmethod
+    async def load_form_choices(cls) -> typing.Dict[str, list]:
+        """ Return the cached `cls.get_form_choices`, loading them if needed. """
+
+        cache = cls.get_form_choices_cache()
+        choices = cache.get("choices")
+        if choices is None:
+            choices = await cls.run_hook(cls.get_form_choices)
+            cache.set("choices", choices)
+        return choices
+
+    @classmethod
+    def invalidate_form_choices(cls) -> None:
+        """ Clear the cached form choices, ie when the objects they list change. """
+
+        cls.get_form_choices_cache().clear()
+
+    @classmethod
+    def apply_form_choices(cls, form: Form, choices: typing.Dict[str, list]) -> None:
+        for name, field_choices in choices.items():
+            if name in form:
+                form[name].choices = field_choices
+
+    @classmethod
+    async def prepare_form(cls, form: Form, request) -> None:
+        """
+        Called with the create and update forms before they are rendered or
+        validated. The cached form choices are set, and each
+        `AutocompleteField` is given the url of its admin's lookup view and
+        the objects of its submitted ids are loaded.
+        """
+
+        cls.apply_form_choices(form, await cls.load_form_choices())
+        await cls.load_autocomplete_objects([form], request)
+
+    @classmethod
+    async def load_autocomplete_objects(cls, forms: list, request) -> None:
+        """
+        Give each `AutocompleteField` of the forms the url of its admin's
+        lookup view and load the objects of its submitted ids. The ids of
+        a field across all the forms, ie a batch of imported rows, are
+        loaded together.
+        """
+
+        fields: typing.Dict[str, list] = {}
+        for form in forms:
+            for field in form:
+                if isinstance(field, AutocompleteField):
+                    field.admin = cls.get_autocomplete_admin(field)
+                    field.url = request.url_for(field.admin.url_names()["lookup"])
+                    fields.setdefault(field.name, []).append(field)
+
+        for name, same_fields in fields.items():
+            admin = same_fields[0].admin
+            ids = list(
+                dict.fromkeys(
+                    id for field in same_fields for id in field.submitted_ids or []
+                )
+            )
+            if not ids:
+                continue
+            objects = await admin.run_hook(admin.get_lookup_objects, request, ids)
+            for field in same_fields:
+                if field.submitted_ids:
+                    field.set_objects(objects)
+
+    @classmethod
+    def get_autocomplete_admin(cls, field: AutocompleteField):
+        """ Return the admin of the field, looking up a mount name on the site. """
+
+        if not isinstance(field.admin, str):
+            return field.admin
+        admin = cls.site.get_admin(field.admin)
+        if admin is None:
+            raise LookupError(f"{field.admin} is not registered")
+        return admin
+
+    @classmethod
+    def get_lookup_page(cls, request) -> int:
+        try:
+            return max(int(request.query_params.get("page", 1)), 1)
+        except ValueError:
+            raise HTTPException(400, "Invalid page")
+
+    @classmethod
+    def get_lookup_results(cls, request) -> typing.Tuple[list, bool]:
+        """
+        Return a tuple of (objects, has more) for the lookup view, the page
+        of `cls.lookup_page_size` objects matching the `search` param.
+        """
+
+        raise NotImplementedError()
+
+    @classmethod
+    def get_lookup_objects(cls, request, ids: typing.List[str]) -> list:
+        """
+        Return the objects with the ids submitted in an `AutocompleteField`,
+        ids that don't match an object are left out.
+        """
+
+        raise NotImplementedError()
+
+    @classmethod
+    def get_lookup_item(cls, obj) -> dict:
+        """ Return the id and text of an object shown by `AutocompleteField`. """
+
+        return {"id": str(cls.get_field_value(obj, "id")), "text": str(obj)}
+
     @classmethod
     async def has_required_scope(cls, request):
-        return has_required_scope(request, cls.permission_scopes)
+        scopes = cls.permission_scopes or cls.site.permission_scopes
+        return has_required_scope(request, scopes)
 
     @classmethod
     async def list_view(cls, request):
         if not await cls.has_required_scope(request):
             raise HTTPException(403)
 
+        validator = await cls.run_hook(cls.get_list_validator, request)
+        etag = cls.get_etag(request, validator)
+        if etag is not None and cls.is_not_modified(request, etag):
+            return cls.not_modified_response(etag)
+
         context = cls.get_context(request)
         context.update(
             {
                 "list_field_names": cls.list_field_names,
+                "get_field_value": cls.get_field_value,
+                "render_row": cls.get_row_renderer().bind(
+                    request, cls.url_names()["edit"], bulk=bool(cls.bulk_actions)
+                ),
+                # the query params for links, the fragment and whole page
+                # share urls so `_fragment` is left out
+                "query_params": QueryParams(
+                    [
+                        (key, value)
+                        for key, value in request.query_params.multi_items()
+                        if key != "_fragment"
+                    ]
+                ),
                 "search_enabled": cls.search_enabled,
                 "search": request.query_params.get("search"),
                 "order_enabled": cls.order_enabled,
                 "order_by": request.query_params.get("order_by"),
                 "order_direction": request.query_params.get("order_direction"),
+                "pagination_mode": cls.pagination_mode,
+                "list_filters": await cls.run_hook(cls.get_list_filters, request),
             }
         )
 
-        list_objects = cls.get_list_objects(request)
+        list_objects = await cls.run_hook(cls.get_list_objects, request)
 
         if cls.paginate_by:
-            paginator, page, list_objects, is_paginated = cls.paginate(
-                request, list_objects
+            paginator, page, list_objects, is_paginated = await cls.run_hook(
+                cls.paginate, request, list_objects
             )
             context.update(
                 {
@@ -160,11 +757,137 @@ class BaseAdmin:
                     "paginator": None,
                     "page_obj": None,
                     "is_paginated": False,
-                    "list_objects": list_objects,
+                    "list_objects": await cls.run_hook(
+                        cls.evaluate_list_objects, list_objects
+                    ),
                 }
             )
 
-        return config.templates.TemplateResponse(cls.list_template, context)
+        template = cls.list_template
+        if cls.is_fragment_request(request):
+            template = cls.list_fragment_template
+
+        if cls.list_streaming_enabled:
+            response = StreamingTemplateResponse(template, context)
+        else:
+            response = config.templates.TemplateResponse(template, context)
+        if etag is not None:
+            response.headers.update(cls.get_cache_headers(etag))
+        else:
+            # the fragment and the whole page share the url
+            response.headers["Vary"] = "X-Fragment"
+        return response
+
+    @classmethod
+    async def bulk_view(cls, request):
+        if not await cls.has_required_scope(request):
+            raise HTTPException(403)
+
+        data = await request.form()
+        action = cls.bulk_actions.get(data.get("action", ""))
+        if action is None:
+            raise HTTPException(400, "Unknown action")
+
+        selection = BulkSelection(
+            ids=data.getlist("ids"), all_matching=data.get("all_matching") == "1"
+        )
+        if selection.ids or selection.all_matching:
+            result = await action.run(cls, request, selection)
+            message(request, *action.get_message(result))
+        else:
+            message(request, "No records were selected", "error")
+
+        # return to the list with the same search, filters and ordering
+        url = request.url_for(cls.url_names()["list"])
+        if request.query_params:
+            url = f"{url}?{request.query_params}"
+        return RedirectResponse(url=url, status_code=302)
+
+    @classmethod
+    async def export_view(cls, request):
+        if not await cls.has_required_scope(request):
+            raise HTTPException(403)
+
+        exporter = cls.export_formats.get(request.query_params.get("format", "csv"))
+        if not cls.export_enabled or exporter is None:
+            raise HTTPException(404)
+
+        objects = await cls.run_hook(cls.get_export_objects, request)
+        field_names = cls.get_export_field_names()
+
+        async def content():
+            yield exporter.header(field_names)
+            async for rows in cls.export_rows(request, objects):
+                yield exporter.encode(field_names, rows)
+
+        filename = f"{cls.mount_name()}.{exporter.extension}"
+        return StreamingResponse(
+            content(),
+            media_type=exporter.media_type,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
+    @classmethod
+    async def import_view(cls, request):
+        if not await cls.has_required_scope(request):
+            raise HTTPException(403)
+
+        if not cls.import_enabled:
+            raise HTTPException(404)
+
+        if not cls.create_form:
+            raise MissingFormError()
+
+        context = cls.get_context(request)
+        context.update({"import_formats": cls.import_formats, "result": None})
+
+        if request.method == "GET":
+            return config.templates.TemplateResponse(cls.import_template, context)
+
+        data = await request.form()
+        upload = data.get("file")
+        importer = cls.import_formats.get(data.get("format", ""))
+        if not isinstance(upload, UploadFile) or importer is None:
+            context.update({"error": "Choose a file and its format to import"})
+            return config.templates.TemplateResponse(cls.import_template, context)
+
+        rows = importer.read(upload.file)
+        result = {"created": 0, "failed": 0, "errors": []}
+        await cls.load_form_choices()
+
+        while True:
+            count, forms, errors = await cls.run_sync(
+                cls.get_import_forms, rows, importer
+            )
+            if not count:
+                break
+            await cls.load_autocomplete_objects([form for _, form in forms], request)
+            forms, invalid = await cls.run_sync(cls.validate_import_forms, forms)
+            errors.extend(invalid)
+            if forms:
+                errors.extend(await cls.do_import_batch(forms, request))
+            result["created"] += count - len(errors)
+            result["failed"] += len(errors)
+            space = cls.import_max_errors - len(result["errors"])
+            result["errors"].extend(sorted(errors)[:space])
+
+        await upload.close()
+
+        context.update({"result": result})
+        return config.templates.TemplateResponse(cls.import_template, context)
+
+    @classmethod
+    async def lookup_view(cls, request):
+        if not await cls.has_required_scope(request):
+            raise HTTPException(403)
+
+        if not cls.lookup_enabled:
+            raise HTTPException(404)
+
+        objects, more = await cls.run_hook(cls.get_lookup_results, request)
+        return JSONResponse(
+            {"results": [cls.get_lookup_item(obj) for obj in objects], "more": more}
+        )
 
     @classmethod
     async def create_view(cls, request):
@@ -178,13 +901,15 @@ class BaseAdmin:
 
         if request.method == "GET":
             form = cls.get_form(cls.create_form)
+            await cls.prepare_form(form, request)
             context.update({"form": form})
             return config.templates.TemplateResponse(cls.create_template, context)
 
         data = await request.form()
         form = cls.get_form(cls.create_form, formdata=data)
+        await cls.prepare_form(form, request)
 
-        if not form.validate():
+        if not await cls.run_sync(form.validate):
             context.update({"form": form})
             return config.templates.TemplateResponse(cls.create_template, context)
 
@@ -204,7 +929,14 @@ class BaseAdmin:
         if not cls.update_form:
             raise MissingFormError()
 
-        instance = cls.get_object(request)
+        etag = None
+        if request.method == "GET":
+            validator = await cls.run_hook(cls.get_object_validator, request)
+            etag = cls.get_etag(request, validator)
+            if etag is not None and cls.is_not_modified(request, etag):
+                return cls.not_modified_response(etag)
+
+        instance = await cls.run_hook(cls.get_object, request)
         context = cls.get_context(request)
         form_kwargs = {
             "form_cls": cls.update_form,
@@ -212,19 +944,54 @@ class BaseAdmin:
             "obj": instance if not isinstance(instance, dict) else None,
         }
 
+        context.update({"version_field_name": cls.version_field_name})
+
         if request.method == "GET":
             form = cls.get_form(**form_kwargs)
-            context.update({"form": form, "object": instance})
-            return config.templates.TemplateResponse(cls.update_template, context)
+            await cls.prepare_form(form, request)
+            context.update(
+                {
+                    "form": form,
+                    "object": instance,
+                    "version": cls.get_object_version(instance),
+                }
+            )
+            response = config.templates.TemplateResponse(cls.update_template, context)
+            if etag is not None:
+                response.headers.update(cls.get_cache_headers(etag))
+            return response
 
         data = await request.form()
         form = cls.get_form(**form_kwargs, formdata=data)
+        await cls.prepare_form(form, request)
 
-        if not form.validate():
-            context.update({"form": form, "object": instance})
+        if not await cls.run_sync(form.validate):
+            context.update(
+                {
+                    "form": form,
+                    "object": instance,
+                    "version": data.get(cls.version_field_name),
+                }
+            )
             return config.templates.TemplateResponse(cls.update_template, context)
 
-        await cls.do_update(instance, form, request)
+        try:
+            await cls.do_update(instance, form, request)
+        except ConflictError as e:
+            # show the form again with the current version, so saving again
+            # overwrites the other changes
+            instance = await cls.run_hook(cls.get_object, request)
+            context.update(
+                {
+                    "form": form,
+                    "object": instance,
+                    "version": cls.get_object_version(instance),
+                    "conflict": str(e),
+                }
+            )
+            return config.templates.TemplateResponse(
+                cls.update_template, context, status_code=409
+            )
 
         message(request, "Updated successfully", "success")
 
@@ -240,7 +1007,7 @@ class BaseAdmin:
         if not cls.delete_form:
             raise MissingFormError()
 
-        instance = cls.get_object(request)
+        instance = await cls.run_hook(cls.get_object, request)
         context = cls.get_context(request)
         form_kwargs = {
             "form_cls": cls.delete_form,
@@ -256,7 +1023,7 @@ class BaseAdmin:
         data = await request.form()
         form = cls.get_form(**form_kwargs, formdata=data)
 
-        if not form.validate():
+        if not await cls.run_sync(form.validate):
             context.update({"form": form, "object": instance})
             return config.templates.TemplateResponse(cls.delete_template, context)
 
@@ -298,6 +1065,10 @@ class BaseAdmin:
             "create": f"{cls.site.name}:{mount}_create",
             "edit": f"{cls.site.name}:{mount}_edit",
             "delete": f"{cls.site.name}:{mount}_delete",
+            "bulk": f"{cls.site.name}:{mount}_bulk",
+            "export": f"{cls.site.name}:{mount}_export",
+            "import": f"{cls.site.name}:{mount}_import",
+            "lookup": f"{cls.site.name}:{mount}_lookup",
         }
 
     @classmethod
@@ -326,5 +1097,29 @@ class BaseAdmin:
                     methods=["GET", "POST"],
                     name=f"{mount}_delete",
                 ),
+                Route(
+                    "/bulk",
+                    endpoint=cls.bulk_view,
+                    methods=["POST"],
+                    name=f"{mount}_bulk",
+                ),
+                Route(
+                    "/export",
+                    endpoint=cls.export_view,
+                    methods=["GET"],
+                    name=f"{mount}_export",
+                ),
+                Route(
+                    "/import",
+                    endpoint=cls.import_view,
+                    methods=["GET", "POST"],
+                    name=f"{mount}_import",
+                ),
+                Route(
+                    "/lookup",
+                    endpoint=cls.lookup_view,
+                    methods=["GET"],
+                    name=f"{mount}_lookup",
+                ),
             ]
         )
@@ -1,6 +1,19 @@
+import typing
+
+import sqlalchemy as sa
 from sqlalchemy import orm
+from sqlalchemy.exc import IntegrityError
+from starlette.exceptions import HTTPException
+from starlette.responses import Response, StreamingResponse
 from starlette_core.database import Base
 
+from ..actions import BulkResult, BulkSelection
+from ..counts import CountStrategy, ExactCount
+from ..debug import count_queries
+from ..exceptions import ConflictError
+from ..filters import ListFilter
+from ..paginator import KeysetPaginator, QueryPaginator
+from ..search import ILikeSearch, SearchBackend
 from .base import BaseAdmin
 
 
@@ -8,6 +21,19 @@ class ModelAdmin(BaseAdmin):
     """ The base admin class for sqlalchemy crud operations. """
 
     model_class: Base
+    paginator_class = QueryPaginator
+    keyset_paginator_class = KeysetPaginator
+    count_strategy: CountStrategy = ExactCount()
+    threadpool_enabled = True
+    list_load_only: bool = True
+    list_load_columns: typing.Sequence[str] = []
+    list_select_related: typing.Optional[typing.Sequence[str]] = None
+    debug_query_count: bool = False
+    search_fields: typing.Sequence[str] = []
+    search_backend: SearchBackend = ILikeSearch()
+    # columns used to tell when rows have changed, ie for http caching
+    version_column: typing.Optional[str] = None
+    timestamp_column: typing.Optional[str] = None
 
     @classmethod
     def get_default_ordering(cls, qs: orm.Query) -> orm.Query:
@@ -15,13 +41,31 @@ class ModelAdmin(BaseAdmin):
 
     @classmethod
     def get_search_results(cls, qs: orm.Query, term: str) -> orm.Query:
-        raise NotImplementedError()
+        """
+        Filter the query by the search term. By default `cls.search_backend`
+        is used to search the columns in `cls.search_fields`.
+        """
+
+        if not cls.search_fields:
+            raise NotImplementedError()
+        return cls.search_backend.search(qs, cls.model_class, cls.search_fields, term)
+
+    @classmethod
+    def create_search_indexes(cls, connection) -> None:
+        """
+        Create the indexes `cls.search_backend` needs to search the
+        `cls.search_fields`, ie on startup or from a migration.
+        """
+
+        cls.search_backend.create_indexes(
+            connection, cls.model_class, cls.search_fields
+        )
 
     @classmethod
     def get_ordered_results(
         cls, qs: orm.Query, order_by: str, order_direction: str
     ) -> orm.Query:
-        if order_by and order_direction and getattr(cls.model_class, order_by):
+        if order_by and order_direction and getattr(cls.model_class, order_by, None):
             field = getattr(cls.model_class, order_by)
             if order_direction == "desc":
                 qs = qs.order_by(field.desc())
@@ -30,13 +74,146 @@ class ModelAdmin(BaseAdmin):
         return qs
 
     @classmethod
-    def get_list_objects(cls, request):
-        qs = cls.get_queryset()
+    def get_list_objects(cls, request) -> orm.Query:
+        """
+        Return the query of objects to render in the list view.
 
-        # if enabled, call `cls.get_search_results`
-        search = request.query_params.get("search", "").strip().lower()
-        if cls.search_enabled and search:
-            qs = cls.get_search_results(qs, search)
+        The query is returned unevaluated so the paginator can apply
+        LIMIT/OFFSET in the database rather than loading every row.
+        """
+
+        qs = cls.filter_queryset(cls.get_queryset(), request)
+        return qs.options(*cls.get_list_options(request))
+
+    @classmethod
+    def get_list_columns(cls, request) -> typing.List[str]:
+        """
+        Return the names of the columns loaded in the list view. By default
+        the primary key, the columns in `list_field_names`, `list_load_columns`
+        and the column used for keyset pagination.
+        """
+
+        column_attrs = orm.class_mapper(cls.model_class).column_attrs
+        names = ["id", *cls.list_field_names, *cls.list_load_columns]
+        if cls.paginate_by and cls.pagination_mode == "keyset":
+            names.append(cls.get_keyset_ordering(request)[0])
+        return [name for name in dict.fromkeys(names) if name in column_attrs]
+
+    @classmethod
+    def get_list_options(cls, request) -> list:
+        """
+        Return the loader options applied to the list view query. When
+        `cls.list_load_only = True` only the columns from `get_list_columns`
+        are loaded and all others are deferred.
+        """
+
+        options = []
+        if cls.list_load_only:
+            columns = [
+                getattr(cls.model_class, c) for c in cls.get_list_columns(request)
+            ]
+            options.append(orm.load_only(*columns))
+        for path in cls.get_list_select_related():
+            options.append(cls.get_eager_load_option(path))
+        return options
+
+    @classmethod
+    def get_list_select_related(cls) -> typing.List[str]:
+        """
+        Return the relationship paths eagerly loaded in the list view, ie
+        `["customer", "customer.region"]`. Unless `cls.list_select_related`
+        is set these are found from the relationships used by the
+        `list_field_names`, such as `customer.name`.
+        """
+
+        if cls.list_select_related is not None:
+            return list(cls.list_select_related)
+        return cls.get_related_paths(cls.list_field_names)
+
+    @classmethod
+    def get_related_paths(cls, field_names: typing.Sequence[str]) -> typing.List[str]:
+        """ Return the relationship paths used by the dotted field names. """
+
+        paths = []
+        for name in field_names:
+            mapper = orm.class_mapper(cls.model_class)
+            parts = []
+            for part in name.split("."):
+                if part not in mapper.relationships:
+                    break
+                parts.append(part)
+                mapper = mapper.relationships[part].mapper
+            if parts:
+                paths.append(".".join(parts))
+
+        # drop paths that are loaded as part of a longer path
+        return [
+            path
+            for path in dict.fromkeys(paths)
+            if not any(other.startswith(f"{path}.") for other in paths)
+        ]
+
+    @classmethod
+    def get_eager_load_option(cls, path: str):
+        """
+        Return the loader option for a relationship path, many-to-one
+        relationships are joined and collections are loaded with a
+        separate select.
+        """
+
+        option = orm.Load(cls.model_class)
+        model = cls.model_class
+        for part in path.split("."):
+            relationship = orm.class_mapper(model).relationships[part]
+            if relationship.uselist:
+                option = option.selectinload(getattr(model, part))
+            else:
+                option = option.joinedload(getattr(model, part))
+            model = relationship.mapper.class_
+        return option
+
+    @classmethod
+    async def list_view(cls, request):
+        if not cls.debug_query_count:
+            return await super().list_view(request)
+
+        # the template is rendered when the response is created, so lazy
+        # loads while rendering are also counted
+        with count_queries() as counter:
+            response = await super().list_view(request)
+            if isinstance(response, StreamingResponse):
+                # a streamed template renders as it is sent, after the header
+                # would be set, so it is rendered in full here instead
+                response = await cls.get_buffered_response(response)
+        response.headers["X-Query-Count"] = str(counter.count)
+        return response
+
+    @classmethod
+    async def get_buffered_response(cls, response: StreamingResponse) -> Response:
+        chunks = []
+        async for chunk in response.body_iterator:
+            chunks.append(chunk if isinstance(chunk, bytes) else chunk.encode())
+        buffered = Response(
+            b"".join(chunks),
+            status_code=response.status_code,
+            headers={
+                key: value
+                for key, value in response.headers.items()
+                if key != "content-length"
+            },
+        )
+        buffered.background = response.background
+        return buffered
+
+    @classmethod
+    def filter_queryset(cls, qs: orm.Query, request) -> orm.Query:
+        """
+        Apply the search, filters and ordering from the request.query_params
+        to the query used in the list view.
+        """
+
+        qs = cls.apply_search(qs, request)
+        qs = cls.apply_list_filters(qs, request)
 
         # if enabled, sort the results
         order_by = request.query_params.get("order_by")
@@ -46,7 +223,321 @@ class ModelAdmin(BaseAdmin):
         else:
             qs = cls.get_default_ordering(qs)
 
-        return qs.all()
+        return qs
+
+    @classmethod
+    def apply_search(cls, qs: orm.Query, request) -> orm.Query:
+        # if enabled, call `cls.get_search_results`
+        search = request.query_params.get("search", "").strip().lower()
+        if cls.search_enabled and search:
+            qs = cls.get_search_results(qs, search)
+        return qs
+
+    @classmethod
+    def apply_list_filters(
+        cls, qs: orm.Query, request, exclude: typing.Optional[ListFilter] = None
+    ) -> orm.Query:
+        """ Apply each active filter in `cls.list_filters` other than `exclude`. """
+
+        for list_filter in cls.list_filters:
+            if list_filter is exclude:
+                continue
+            value = list_filter.get_value(request, cls.model_class)
+            if value is not None:
+                qs = list_filter.apply(qs, cls.model_class, value)
+        return qs
+
+    @classmethod
+    def get_facet_query(cls, qs: orm.Query, request, list_filter: ListFilter):
+        """
+        Return the query counting the choices of a filter. The counts include
+        the search and all other active filters, so each is the number of rows
+        shown when the choice is selected.
+        """
+
+        qs = cls.apply_list_filters(cls.apply_search(qs, request), request, list_filter)
+        return list_filter.get_facet_query(qs.order_by(None).subquery())
+
+    @classmethod
+    def get_list_filters(cls, request) -> typing.List[dict]:
+        """
+        Return the `cls.list_filters` with the count of each choice. Counts
+        are cached by each filter for its `cache_ttl` keyed by the search and
+        active filters.
+        """
+
+        list_filters = []
+        key = cls.get_count_key(request)
+        for list_filter in cls.list_filters:
+            rows = list_filter.cache.get(key)
+            if rows is None:
+                qs = cls.get_queryset()
+                stmt = cls.get_facet_query(qs, request, list_filter)
+                rows = [tuple(row) for row in qs.session.execute(stmt)]
+                list_filter.cache.set(key, rows)
+            value = list_filter.get_value(request, cls.model_class)
+            list_filters.append(
+                {
+                    "filter": list_filter,
+                    "value": value,
+                    "choices": list_filter.get_choices(rows, value),
+                }
+            )
+        return list_filters
+
+    @classmethod
+    def get_export_objects(cls, request) -> orm.Query:
+        """
+        Return the query of objects to export. Rows are fetched
+        `cls.export_batch_size` at a time using a server side cursor where
+        the database supports one.
+        """
+
+        qs = cls.filter_queryset(cls.get_queryset(), request)
+        return qs.options(*cls.get_export_options()).yield_per(cls.export_batch_size)
+
+    @classmethod
+    def get_export_options(cls) -> list:
+        """
+        Return the loader options applied to the export query, only the
+        export columns are loaded and related objects are eagerly loaded.
+        """
+
+        field_names = cls.get_export_field_names()
+        column_attrs = orm.class_mapper(cls.model_class).column_attrs
+        columns = [
+            getattr(cls.model_class, name)
+            for name in dict.fromkeys(["id", *field_names])
+            if name in column_attrs
+        ]
+        options = [orm.load_only(*columns)]
+        for path in cls.get_related_paths(field_names):
+            options.append(cls.get_eager_load_option(path))
+        return options
+
+    @classmethod
+    def get_bulk_criteria(
+        cls, qs: orm.Query, request, selection: BulkSelection
+    ) -> list:
+        """
+        Return the where criteria matching the objects selected for a bulk
+        action, so actions run as a single statement without loading them.
+        """
+
+        qs = cls.apply_list_filters(cls.apply_search(qs, request), request)
+        criteria = [] if qs.whereclause is None else [qs.whereclause]
+        if not selection.all_matching:
+            python_type = cls.model_class.id.type.python_type
+            try:
+                ids = [python_type(id) for id in selection.ids]
+            except (TypeError, ValueError):
+                raise HTTPException(400, "Invalid ids")
+            criteria.append(cls.model_class.id.in_(ids))
+        return criteria
+
+    @classmethod
+    async def do_bulk_delete(cls, request, selection: BulkSelection) -> BulkResult:
+        criteria = cls.get_bulk_criteria(cls.get_queryset(), request, selection)
+        stmt = sa.delete(cls.model_class)
+        return await cls.run_sync(cls.execute_bulk, stmt, criteria)
+
+    @classmethod
+    async def do_bulk_update(
+        cls, request, selection: BulkSelection, values: dict
+    ) -> BulkResult:
+        criteria = cls.get_bulk_criteria(cls.get_queryset(), request, selection)
+        stmt = sa.update(cls.model_class).values(cls.get_bulk_update_values(values))
+        return await cls.run_sync(cls.execute_bulk, stmt, criteria)
+
+    @classmethod
+    def get_bulk_update_values(cls, values: dict) -> dict:
+        """
+        Return the values set by a bulk update, with `cls.version_column`
+        moved on in the same statement so the ETags of the rows change and
+        forms opened before the update conflict when saved.
+        """
+
+        if cls.version_column:
+            column = cls.get_version_column()
+            values = {**values, column.key: cls.get_next_version(column)}
+        return values
+
+    @classmethod
+    def execute_bulk(cls, stmt, criteria: list) -> BulkResult:
+        """
+        Execute an update or delete statement for the rows matching the
+        criteria in one transaction. On an `IntegrityError` it is retried for
+        each row in a savepoint to find the ids that failed.
+        """
+
+        session = cls.get_queryset().session
+        stmt = stmt.execution_options(synchronize_session=False)
+        try:
+            result = session.execute(stmt.where(*criteria))
+            session.commit()
+            return BulkResult(result.rowcount, [])
+        except IntegrityError:
+            session.rollback()
+
+        ids = session.execute(sa.select(cls.model_class.id).where(*criteria))
+        count, failed_ids = 0, []
+        for id in ids.scalars().all():
+            try:
+                with session.begin_nested():
+                    session.execute(stmt.where(cls.model_class.id == id))
+                count += 1
+            except IntegrityError:
+                failed_ids.append(id)
+        session.commit()
+        return BulkResult(count, failed_ids)
+
+    @classmethod
+    def get_validator_columns(cls) -> list:
+        """
+        Return the aggregates making up the list validator, the count and
+        highest id of the rows plus the latest `cls.timestamp_column` and the
+        total of `cls.version_column`.
+        """
+
+        model = cls.model_class
+        columns = [sa.func.count(model.id), sa.func.max(model.id)]
+        if cls.timestamp_column:
+            columns.append(sa.func.max(getattr(model, cls.timestamp_column)))
+        if cls.version_column:
+            columns.append(sa.func.sum(getattr(model, cls.version_column)))
+        return columns
+
+    @classmethod
+    def get_list_validator_query(cls, qs, request):
+        qs = cls.apply_list_filters(cls.apply_search(qs, request), request)
+        stmt = sa.select(*cls.get_validator_columns())
+        if qs.whereclause is not None:
+            stmt = stmt.where(qs.whereclause)
+        return stmt
+
+    @classmethod
+    def get_object_validator_query(cls, request):
+        column = getattr(cls.model_class, cls.version_column or cls.timestamp_column)
+        return sa.select(column).where(cls.model_class.id == request.path_params["id"])
+
+    @classmethod
+    def get_list_validator(cls, request) -> typing.Optional[typing.Hashable]:
+        if not (cls.version_column or cls.timestamp_column):
+            return None
+        qs = cls.get_queryset()
+        stmt = cls.get_list_validator_query(qs, request)
+        return tuple(qs.session.execute(stmt).one())
+
+    @classmethod
+    def get_object_validator(cls, request) -> typing.Optional[typing.Hashable]:
+        if not (cls.version_column or cls.timestamp_column):
+            return None
+        qs = cls.get_queryset()
+        return qs.session.execute(cls.get_object_validator_query(request)).scalar()
+
+    @classmethod
+    def get_lookup_query(cls, qs: orm.Query, request) -> orm.Query:
+        """
+        Return the query of the lookup view, searching `cls.search_fields`
+        for the `search` param. One more than a page is selected to tell if
+        there are more results.
+        """
+
+        term = request.query_params.get("search", "").strip().lower()
+        if term:
+            qs = cls.get_search_results(qs, term)
+        offset = (cls.get_lookup_page(request) - 1) * cls.lookup_page_size
+        return (
+            cls.get_default_ordering(qs).offset(offset).limit(cls.lookup_page_size + 1)
+        )
+
+    @classmethod
+    def get_lookup_results(cls, request) -> typing.Tuple[list, bool]:
+        objects = cls.get_lookup_query(cls.get_queryset(), request).all()
+        return objects[: cls.lookup_page_size], len(objects) > cls.lookup_page_size
+
+    @classmethod
+    def get_lookup_ids(cls, ids: typing.List[str]) -> list:
+        """ Return the ids as the type of the primary key, dropping invalid ids. """
+
+        python_type = cls.model_class.id.type.python_type
+        coerced = []
+        for id in ids:
+            try:
+                coerced.append(python_type(id))
+            except (TypeError, ValueError):
+                continue
+        return coerced
+
+    @classmethod
+    def get_lookup_objects(cls, request, ids: typing.List[str]) -> list:
+        qs = cls.get_queryset()
+        return qs.filter(cls.model_class.id.in_(cls.get_lookup_ids(ids))).all()
+
+    @classmethod
+    def get_count_key(cls, request) -> typing.Hashable:
+        """
+        Return a key that identifies the rows being counted, used by
+        `cls.count_strategy` when caching counts. Only the params that
+        filter the results are included.
+        """
+
+        ignored = {
+            "page",
+            "after",
+            "before",
+            "order_by",
+            "order_direction",
+            "_fragment",
+        }
+        params = sorted(
+            (k, v)
+            for k, v in request.query_params.multi_items()
+            if k not in ignored and v
+        )
+        return (cls.site.name, cls.mount_name(), tuple(params))
+
+    @classmethod
+    def get_paginator(cls, request, objects):
+        # other paginators, ie starlette_core's, don't take a count strategy
+        if not issubclass(cls.paginator_class, QueryPaginator):
+            return super().get_paginator(request, objects)
+
+        return cls.paginator_class(
+            objects,
+            cls.paginate_by,
+            count_strategy=cls.count_strategy,
+            count_key=cls.get_count_key(request),
+        )
+
+    @classmethod
+    def get_keyset_ordering(cls, request) -> typing.Tuple[str, str]:
+        """
+        Return the (column name, direction) used to order the list when
+        `cls.pagination_mode = "keyset"`. The primary key is always used as a
+        tie breaker so the column does not need to be unique.
+        """
+
+        order_by = request.query_params.get("order_by")
+        order_direction = request.query_params.get("order_direction")
+        if cls.order_enabled and order_by and order_direction:
+            return order_by, order_direction
+        return "id", "asc"
+
+    @classmethod
+    def get_keyset_paginator(cls, request, objects):
+        order_by, order_direction = cls.get_keyset_ordering(request)
+        mapper = orm.class_mapper(cls.model_class)
+        if order_by not in mapper.column_attrs:
+            order_by = "id"
+
+        return cls.keyset_paginator_class(
+            objects,
+            cls.paginate_by,
+            order_column=getattr(cls.model_class, order_by),
+            id_column=cls.model_class.id,
+            order_direction=order_direction,
+        )
 
     @classmethod
     def get_queryset(cls) -> orm.Query:
@@ -59,17 +550,270 @@ class ModelAdmin(BaseAdmin):
 
     @classmethod
     async def do_create(cls, form, request):
+        instance = cls.create_instance(form, request)
+        await cls.run_sync(instance.save)
+        return instance
+
+    @classmethod
+    def create_instance(cls, form, request):
+        """
+        Return a new unsaved object populated from the form, used by
+        `cls.do_create` and for each imported row. Override to set fields
+        not in the form, ie the owner.
+        """
+
         instance = cls.model_class()
         form.populate_obj(instance)
-        instance.save()
         return instance
 
     @classmethod
     async def do_delete(cls, instance, form, request):
-        instance.delete()
+        await cls.run_sync(instance.delete)
+
+    @classmethod
+    async def do_import_batch(cls, forms: list, request) -> list:
+        # an overridden `do_create` is called for each row so it isn't skipped
+        if cls.do_create.__func__ is not ModelAdmin.do_create.__func__:  # type: ignore
+            return await super().do_import_batch(forms, request)
+
+        instances = [(line, cls.create_instance(form, request)) for line, form in forms]
+        return await cls.run_sync(cls.save_import_batch, instances)
+
+    @classmethod
+    def save_import_batch(cls, instances: list) -> list:
+        """
+        Insert the objects for a batch of (line, instance) in one transaction,
+        leaving it to sqlalchemy to batch the inserts into executemany
+        calls. If any row fails each is retried in a savepoint so only the
+        failing rows are reported and the rest are saved.
+        """
+
+        session = cls.get_queryset().session
+        try:
+            session.add_all([instance for _, instance in instances])
+            session.commit()
+            return []
+        except IntegrityError:
+            session.rollback()
+
+        errors = []
+        for line, instance in instances:
+            try:
+                with session.begin_nested():
+                    session.add(instance)
+            except IntegrityError as e:
+                errors.append((line, str(e.orig)))
+        session.commit()
+        return errors
 
     @classmethod
     async def do_update(cls, instance, form, request):
         form.populate_obj(instance)
-        instance.save()
+        changes = cls.get_changes(instance)
+        # nothing is written when the form was saved without changes
+        if changes:
+            if cls.version_column:
+                version = await cls.get_submitted_version(instance, request)
+                await cls.run_sync(cls.save_versioned, instance, version)
+            else:
+                await cls.run_sync(instance.save)
+        await cls.on_update(instance, changes, request)
         return instance
+
+    @classmethod
+    async def on_update(cls, instance, changes: dict, request) -> None:
+        """
+        Called after an object is updated with the `(old, new)` values of
+        the columns and relationships changed, ie to record them in an audit
+        log. `changes` is empty when the form was saved without changes.
+        """
+
+    @classmethod
+    def get_changes(
+        cls, instance
+    ) -> typing.Dict[str, typing.Tuple[typing.Any, typing.Any]]:
+        """
+        Return the `(old, new)` values of the columns and relationships
+        changed on the instance. Related objects are given by their primary
+        key, or a list of them for collections.
+        """
+
+        changes = cls.get_column_changes(instance)
+        changes.update(cls.get_relationship_changes(instance))
+        return changes
+
+    @classmethod
+    def get_column_changes(
+        cls, instance
+    ) -> typing.Dict[str, typing.Tuple[typing.Any, typing.Any]]:
+        """
+        Return the `(old, new)` values of the columns changed on the
+        instance, old is `None` when it was not loaded.
+        """
+
+        state = sa.inspect(instance)
+        changes = {}
+        for attr in state.attrs:
+            if attr.key not in state.mapper.column_attrs:
+                continue
+            history = attr.history
+            if history.has_changes():
+                old = history.deleted[0] if history.deleted else None
+                new = history.added[0] if history.added else None
+                changes[attr.key] = (old, new)
+        return changes
+
+    @classmethod
+    def get_relationship_changes(
+        cls, instance
+    ) -> typing.Dict[str, typing.Tuple[typing.Any, typing.Any]]:
+        """
+        Return the `(old, new)` primary keys of the related objects changed
+        on the instance, lists of them for collections.
+        """
+
+        state = sa.inspect(instance)
+        changes = {}
+        for relationship in state.mapper.relationships:
+            history = state.attrs[relationship.key].history
+            if not history.has_changes():
+                continue
+            old: typing.Any
+            new: typing.Any
+            if relationship.uselist:
+                old = [
+                    cls.get_identity(obj)
+                    for obj in (*history.unchanged, *history.deleted)
+                ]
+                new = [
+                    cls.get_identity(obj)
+                    for obj in (*history.unchanged, *history.added)
+                ]
+            else:
+                if history.deleted:
+                    old = cls.get_identity(history.deleted[0])
+                else:
+                    # the previous object was not loaded, its key is still
+                    # in the foreign key columns until the flush
+                    old = cls.get_foreign_key(instance, relationship)
+                new = cls.get_identity(history.added[0]) if history.added else None
+            if old != new:
+                changes[relationship.key] = (old, new)
+        return changes
+
+    @classmethod
+    def get_identity(cls, obj) -> typing.Any:
+        """
+        Return the primary key of a related object, or the object itself
+        when it has not been saved.
+        """
+
+        if obj is None:
+            return None
+        identity = sa.inspect(obj).identity
+        if identity is None:
+            return obj
+        return identity[0] if len(identity) == 1 else identity
+
+    @classmethod
+    def get_foreign_key(cls, instance, relationship) -> typing.Any:
+        """
+        Return the primary key of the object a many to one relationship
+        refers to from the instance's foreign key columns.
+        """
+
+        if relationship.direction is not orm.interfaces.MANYTOONE:
+            return None
+        mapper = sa.inspect(instance).mapper
+        values = tuple(
+            getattr(instance, mapper.get_property_by_column(column).key)
+            for column, _ in relationship.local_remote_pairs
+        )
+        if all(value is None for value in values):
+            return None
+        return values[0] if len(values) == 1 else values
+
+    @classmethod
+    def get_object_version(cls, instance) -> typing.Any:
+        if not cls.version_column:
+            return None
+        return getattr(instance, cls.version_column)
+
+    @classmethod
+    def get_version_column(cls):
+        return getattr(cls.model_class, cls.version_column or "")
+
+    @classmethod
+    async def get_submitted_version(cls, instance, request) -> typing.Any:
+        """
+        Return the version posted with the update form. When it is missing
+        the version the instance was loaded with is used.
+        """
+
+        data = await request.form()
+        column = cls.get_version_column()
+        try:
+            return column.type.python_type(data[cls.version_field_name])
+        except (KeyError, TypeError, ValueError):
+            state = sa.inspect(instance).attrs[column.key]
+            history = state.history
+            return history.deleted[0] if history.deleted else state.value
+
+    @classmethod
+    def get_next_version(cls, version) -> typing.Any:
+        return version + 1
+
+    @classmethod
+    def get_changed_values(cls, instance) -> typing.Dict[str, typing.Any]:
+        """ Return the new values of the columns changed on the instance. """
+
+        return {
+            key: new for key, (old, new) in cls.get_column_changes(instance).items()
+        }
+
+    @classmethod
+    def get_versioned_update(cls, instance, version, values: dict):
+        """
+        Return the UPDATE of the values that only matches the row while it
+        still has the version the form was loaded with.
+        """
+
+        model = cls.model_class
+        column = cls.get_version_column()
+        return (
+            sa.update(model)
+            .where(model.id == instance.id, column == version)
+            .values({getattr(model, key): value for key, value in values.items()})
+            .execution_options(synchronize_session=False)
+        )
+
+    @classmethod
+    def apply_versioned_update(cls, session, instance, version) -> None:
+        """
+        Write the changed columns and the next version in a single
+        conditional UPDATE, raising `ConflictError` when the row was changed
+        by someone else. Other changes, ie to relationships, are left to be
+        flushed in the same transaction.
+        """
+
+        values = cls.get_changed_values(instance)
+        values[cls.get_version_column().key] = cls.get_next_version(version)
+        result = session.execute(cls.get_versioned_update(instance, version, values))
+        if result.rowcount != 1:
+            raise ConflictError(
+                "This record was changed by someone else since you opened it, "
+                "save again to overwrite their changes."
+            )
+        # the columns are already written so are not flushed again
+        for key, value in values.items():
+            orm.attributes.set_committed_value(instance, key, value)
+
+    @classmethod
+    def save_versioned(cls, instance, version) -> None:
+        session = orm.object_session(instance)
+        try:
+            cls.apply_versioned_update(session, instance, version)
+        except ConflictError:
+            session.rollback()
+            raise
+        session.commit()
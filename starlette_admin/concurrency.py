@@ -0,0 +1,24 @@
+import asyncio
+import contextvars
+import functools
+import typing
+from concurrent.futures import Executor
+
+T = typing.TypeVar("T")
+
+
+async def run_in_executor(
+    executor: typing.Optional[Executor],
+    func: typing.Callable[..., T],
+    *args: typing.Any,
+    **kwargs: typing.Any,
+) -> T:
+    """
+    Run a blocking function in the executor, the current context is copied
+    so context vars such as the request scoped database session still apply.
+    """
+
+    loop = asyncio.get_event_loop()
+    child = functools.partial(func, *args, **kwargs)
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(executor, context.run, child)
@@ -6,6 +6,9 @@ class AppConfig:
     templates: Jinja2Templates = Jinja2Templates(
         loader=jinja2.PackageLoader("starlette_admin")
     )
+    # the version of the application, pages cached by browsers under another
+    # version are rendered again
+    version: str = ""
 
 
 config = AppConfig()
@@ -0,0 +1,90 @@
+import json
+import typing
+
+from sqlalchemy import orm
+
+from .cache import TTLCache
+
+
+class CountStrategy:
+    """ The base class for the ways of counting the rows of a list view. """
+
+    def get_count(
+        self, qs: orm.Query, key: typing.Hashable = None
+    ) -> typing.Tuple[int, bool]:
+        """
+        Return a tuple of (count, is_estimate) for the query. `key` identifies
+        the query, ie the admin and the search/filters applied.
+        """
+        raise NotImplementedError()
+
+
+class ExactCount(CountStrategy):
+    """ Counts the rows of the query with `SELECT count(*)`. """
+
+    def get_count(
+        self, qs: orm.Query, key: typing.Hashable = None
+    ) -> typing.Tuple[int, bool]:
+        # ordering has no effect on the count so drop it from the query
+        return qs.order_by(None).count(), False
+
+
+class EstimatedCount(ExactCount):
+    """
+    Estimates the number of rows from the query planner, currently only
+    supported on PostgreSQL. When the estimate is below `threshold` an
+    exact count is performed instead as it will be cheap.
+    """
+
+    def __init__(self, threshold: int = 10000) -> None:
+        self.threshold = threshold
+
+    def get_count(
+        self, qs: orm.Query, key: typing.Hashable = None
+    ) -> typing.Tuple[int, bool]:
+        estimate = self.get_estimate(qs)
+        if estimate is None or estimate < self.threshold:
+            return super().get_count(qs, key)
+        return estimate, True
+
+    def get_estimate(self, qs: orm.Query) -> typing.Optional[int]:
+        connection = qs.session.connection()
+        if connection.dialect.name != "postgresql":
+            return None
+
+        compiled = qs.order_by(None).statement.compile(dialect=connection.dialect)
+        result = connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled.string}", compiled.params
+        )
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class CachedCount(CountStrategy):
+    """
+    Caches the count from another strategy for `ttl` seconds, an exact
+    count is used by default.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        strategy: typing.Optional[CountStrategy] = None,
+        maxsize: int = 1024,
+    ) -> None:
+        self.strategy = strategy or ExactCount()
+        self.cache = TTLCache(ttl=ttl, maxsize=maxsize)
+
+    def get_count(
+        self, qs: orm.Query, key: typing.Hashable = None
+    ) -> typing.Tuple[int, bool]:
+        if key is None:
+            return self.strategy.get_count(qs, key)
+
+        result = self.cache.get(key)
+        if result is None:
+            result = self.strategy.get_count(qs, key)
+            self.cache.set(key, result)
+        return result
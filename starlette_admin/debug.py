@@ -0,0 +1,47 @@
+import contextlib
+import typing
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_query_counter_ctx_var: ContextVar[typing.Optional["QueryCounter"]] = ContextVar(
+    "query_counter", default=None
+)
+
+
+class QueryCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __repr__(self):
+        return f"<QueryCounter count={self.count}>"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_counter_ctx_var.get()
+    if counter is not None:
+        counter.count += 1
+
+
+@contextlib.contextmanager
+def count_queries() -> typing.Iterator[QueryCounter]:
+    """
+    Count the sql statements executed by any engine within the block,
+    including work run in the admin thread pool as the context is copied.
+
+    Usage:
+        with count_queries() as counter:
+            ...
+        print(counter.count)
+    """
+
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+
+    counter = QueryCounter()
+    token = _query_counter_ctx_var.set(counter)
+    try:
+        yield counter
+    finally:
+        _query_counter_ctx_var.reset(token)
@@ -1,2 +1,10 @@
 class MissingFormError(Exception):
     pass
+
+
+class AlreadyRegistered(Exception):
+    pass
+
+
+class ConflictError(Exception):
+    pass
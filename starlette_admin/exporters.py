@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+import typing
+
+
+class Exporter:
+    """
+    The base class for the formats the list view can be exported as. Rows
+    are encoded a batch at a time so the export can be streamed.
+    """
+
+    label: str = ""
+    media_type: str = ""
+    extension: str = ""
+
+    def header(self, field_names: typing.Sequence[str]) -> str:
+        """ Return the text written before the first row. """
+
+        return ""
+
+    def encode(
+        self, field_names: typing.Sequence[str], rows: typing.Sequence[list]
+    ) -> str:
+        """ Return a batch of rows, each a list of values, as text. """
+        raise NotImplementedError()
+
+
+class CSVExporter(Exporter):
+    label = "CSV"
+    media_type = "text/csv"
+    extension = "csv"
+
+    def write(self, rows: typing.Iterable[typing.Sequence]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+
+    def header(self, field_names: typing.Sequence[str]) -> str:
+        return self.write([field_names])
+
+    def encode(
+        self, field_names: typing.Sequence[str], rows: typing.Sequence[list]
+    ) -> str:
+        return self.write(rows)
+
+
+class NDJSONExporter(Exporter):
+    """ Writes each row as a json object on its own line. """
+
+    label = "JSON Lines"
+    media_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    def encode(
+        self, field_names: typing.Sequence[str], rows: typing.Sequence[list]
+    ) -> str:
+        return "".join(
+            json.dumps(dict(zip(field_names, row)), default=str) + "\n" for row in rows
+        )
@@ -0,0 +1,233 @@
+import datetime
+import typing
+
+import sqlalchemy as sa
+from sqlalchemy import orm
+
+from .cache import TTLCache
+
+# changing a filter starts again from the first page
+RESET_PAGE_PARAMS = {"page": "", "after": "", "before": ""}
+
+
+class FilterChoice(typing.NamedTuple):
+    label: str
+    params: dict
+    total: typing.Optional[int]
+    selected: bool
+
+
+class ListFilter:
+    """
+    The base class for filters shown alongside the list view. Filters are
+    applied to the sql query and each choice shows the number of rows it
+    would match, counted with a single grouped query per filter and cached
+    for `cache_ttl` seconds.
+    """
+
+    template = "starlette_admin/partials/list_filter.html"
+
+    def __init__(
+        self, field: str, label: typing.Optional[str] = None, cache_ttl: float = 30
+    ) -> None:
+        self.field = field
+        self.label = label or field.replace("_", " ").title()
+        self.cache = TTLCache(ttl=cache_ttl)
+
+    @property
+    def parameter_names(self) -> typing.List[str]:
+        """ The query params used by this filter. """
+
+        return [self.field]
+
+    @property
+    def clear_params(self) -> dict:
+        return {**{name: "" for name in self.parameter_names}, **RESET_PAGE_PARAMS}
+
+    def get_column(self, model):
+        return getattr(model, self.field)
+
+    def get_value(self, request, model) -> typing.Any:
+        """
+        Return the value of the filter from the request.query_params or
+        `None` when the filter is not active.
+        """
+        raise NotImplementedError()
+
+    def apply(self, qs: orm.Query, model, value: typing.Any) -> orm.Query:
+        """ Return the query filtered by the value. """
+        raise NotImplementedError()
+
+    def get_facet_query(self, subquery) -> sa.sql.Select:
+        """
+        Return the grouped query used to count the choices, `subquery` is the
+        list query with the search and all other filters applied.
+        """
+        raise NotImplementedError()
+
+    def get_choices(self, rows: list, value: typing.Any) -> typing.List[FilterChoice]:
+        """ Return the choices from the rows of the facet query. """
+        raise NotImplementedError()
+
+    def coerce(self, model, value: str) -> typing.Any:
+        python_type = self.get_column(model).type.python_type
+        if python_type in (datetime.date, datetime.datetime):
+            return python_type.fromisoformat(value)
+        return python_type(value)
+
+
+class ValueFilter(ListFilter):
+    """ Filters by the distinct values of a column, ie a status. """
+
+    def __init__(
+        self,
+        field: str,
+        label: typing.Optional[str] = None,
+        cache_ttl: float = 30,
+        max_choices: int = 20,
+    ) -> None:
+        super().__init__(field, label, cache_ttl)
+        self.max_choices = max_choices
+
+    def get_value(self, request, model) -> typing.Any:
+        value = request.query_params.get(self.field)
+        if not value:
+            return None
+        try:
+            return self.coerce(model, value)
+        except (TypeError, ValueError):
+            return None
+
+    def apply(self, qs: orm.Query, model, value: typing.Any) -> orm.Query:
+        return qs.filter(self.get_column(model) == value)
+
+    def get_facet_query(self, subquery) -> sa.sql.Select:
+        column = subquery.c[self.field]
+        count = sa.func.count().label("count")
+        return (
+            sa.select(column, count)
+            .where(column.isnot(None))
+            .group_by(column)
+            .order_by(count.desc(), column)
+            .limit(self.max_choices)
+        )
+
+    def get_choices(self, rows: list, value: typing.Any) -> typing.List[FilterChoice]:
+        return [
+            FilterChoice(
+                label=str(row_value),
+                params={self.field: row_value, **RESET_PAGE_PARAMS},
+                total=count,
+                selected=row_value == value,
+            )
+            for row_value, count in rows
+        ]
+
+
+class BooleanFilter(ListFilter):
+    """ Filters a boolean column by yes or no. """
+
+    def get_value(self, request, model) -> typing.Optional[bool]:
+        value = request.query_params.get(self.field)
+        if value == "1":
+            return True
+        if value == "0":
+            return False
+        return None
+
+    def apply(self, qs: orm.Query, model, value: typing.Any) -> orm.Query:
+        return qs.filter(self.get_column(model).is_(value))
+
+    def get_facet_query(self, subquery) -> sa.sql.Select:
+        column = subquery.c[self.field]
+        return sa.select(column, sa.func.count()).group_by(column)
+
+    def get_choices(self, rows: list, value: typing.Any) -> typing.List[FilterChoice]:
+        counts = {
+            bool(row_value): count for row_value, count in rows if row_value is not None
+        }
+        return [
+            FilterChoice(
+                label=label,
+                params={self.field: param, **RESET_PAGE_PARAMS},
+                total=counts.get(choice, 0),
+                selected=value is choice,
+            )
+            for label, param, choice in (("Yes", "1", True), ("No", "0", False))
+        ]
+
+
+class DateRangeFilter(ListFilter):
+    """
+    Filters a date or datetime column between the `<field>__from` and
+    `<field>__to` dates, both inclusive, with a choice of preset ranges.
+    """
+
+    template = "starlette_admin/partials/list_filter_date.html"
+
+    @property
+    def parameter_names(self) -> typing.List[str]:
+        return [f"{self.field}__from", f"{self.field}__to"]
+
+    def get_presets(
+        self,
+    ) -> typing.List[typing.Tuple[str, datetime.date, datetime.date]]:
+        """ Return the preset ranges as (label, from date, to date). """
+
+        today = datetime.date.today()
+        return [
+            ("Today", today, today),
+            ("Past 7 days", today - datetime.timedelta(days=6), today),
+            ("This month", today.replace(day=1), today),
+            ("This year", today.replace(month=1, day=1), today),
+        ]
+
+    def get_value(self, request, model) -> typing.Any:
+        values: typing.List[typing.Optional[datetime.date]] = []
+        for name in self.parameter_names:
+            try:
+                values.append(datetime.date.fromisoformat(request.query_params[name]))
+            except (KeyError, ValueError):
+                values.append(None)
+        if values == [None, None]:
+            return None
+        return tuple(values)
+
+    def get_condition(self, column, date_from, date_to):
+        conditions = []
+        if date_from is not None:
+            conditions.append(column >= date_from)
+        if date_to is not None:
+            conditions.append(column < date_to + datetime.timedelta(days=1))
+        return sa.and_(*conditions)
+
+    def apply(self, qs: orm.Query, model, value: typing.Any) -> orm.Query:
+        return qs.filter(self.get_condition(self.get_column(model), *value))
+
+    def get_facet_query(self, subquery) -> sa.sql.Select:
+        column = subquery.c[self.field]
+        return sa.select(
+            *[
+                sa.func.count(sa.case((self.get_condition(column, start, end), 1)))
+                for _, start, end in self.get_presets()
+            ]
+        )
+
+    def get_choices(self, rows: list, value: typing.Any) -> typing.List[FilterChoice]:
+        counts = rows[0] if rows else []
+        choices = []
+        for index, (label, start, end) in enumerate(self.get_presets()):
+            from_param, to_param = self.parameter_names
+            choices.append(
+                FilterChoice(
+                    label=label,
+                    params={
+                        from_param: start.isoformat(),
+                        to_param: end.isoformat(),
+                        **RESET_PAGE_PARAMS,
+                    },
+                    total=counts[index] if counts else None,
+                    selected=value == (start, end),
+                )
+            )
+        return choices
@@ -1,8 +1,9 @@
 import json
+import typing
 
 from wtforms import fields, widgets
 
-from .widgets import TagsInput
+from .widgets import AutocompleteInput, TagsInput
 
 
 class JSONField(fields.StringField):
@@ -29,3 +30,58 @@ class JSONField(fields.StringField):
 
 class TagsField(JSONField):
     widget = TagsInput()
+
+
+class AutocompleteField(fields.Field):
+    """
+    Chooses one, or with `multiple=True` many, objects of another admin.
+    Options are searched as you type using the lookup view of the admin,
+    either the admin class or its mount name, so the choices are never all
+    rendered. Only the submitted ids are loaded, by `BaseAdmin.prepare_form`.
+    """
+
+    widget = AutocompleteInput()
+
+    def __init__(
+        self, label=None, validators=None, admin=None, multiple=False, **kwargs
+    ):
+        super().__init__(label, validators, **kwargs)
+        self.admin = admin
+        self.multiple = multiple
+        # the url of the admin's lookup view, set by `BaseAdmin.prepare_form`
+        self.url = ""
+        self.submitted_ids = None
+        self.missing_ids = None
+
+    def process_formdata(self, valuelist):
+        self.submitted_ids = [value for value in valuelist if value]
+        # the objects are set once loaded with `set_objects`
+        self.data = [] if self.multiple else None
+
+    def get_objects(self) -> list:
+        if self.multiple:
+            return list(self.data or [])
+        return [] if self.data is None else [self.data]
+
+    def set_objects(self, objects) -> None:
+        """ Set the data from the objects loaded for the submitted ids. """
+
+        found = {str(self.admin.get_field_value(obj, "id")): obj for obj in objects}
+        ids = self.submitted_ids or []
+        self.missing_ids = [id for id in ids if id not in found]
+        selected = [found[id] for id in ids if id in found]
+        if self.multiple:
+            self.data = selected
+        else:
+            self.data = selected[0] if selected else None
+
+    def get_selected_items(self) -> typing.List[dict]:
+        return [self.admin.get_lookup_item(obj) for obj in self.get_objects()]
+
+    def pre_validate(self, form):
+        if self.submitted_ids and self.missing_ids is None:
+            raise ValueError("The choices could not be loaded")
+        if self.missing_ids:
+            raise ValueError("Not a valid choice")
+        if not self.multiple and len(self.submitted_ids or []) > 1:
+            raise ValueError("Only one choice is allowed")
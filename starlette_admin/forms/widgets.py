@@ -1,8 +1,84 @@
 import json
 
+from jinja2.utils import escape
 from wtforms import widgets
 
 
+class AutocompleteInput:
+    """
+    Searches the lookup view of `AutocompleteField.admin` as you type, the
+    chosen ids are posted as hidden inputs.
+    """
+
+    def __call__(self, field, **kwargs):
+        kwargs.setdefault("id", field.id)
+        config = {
+            "url": field.url,
+            "name": field.name,
+            "multiple": field.multiple,
+            "selected": field.get_selected_items(),
+        }
+        return widgets.HTMLString(
+            """
+            <div class="select-multi-field"
+                x-data="Object.assign(%s, {
+                    results: [],
+                    term: '',
+                    page: 1,
+                    more: false,
+                    open: false,
+                    load(page) {
+                        const params = new URLSearchParams({search: this.term, page});
+                        window.fetch(this.url + '?' + params, {credentials: 'same-origin'})
+                            .then(response => response.json())
+                            .then(data => {
+                                this.results = page > 1 ? this.results.concat(data.results) : data.results;
+                                this.page = page;
+                                this.more = data.more;
+                                this.open = true;
+                            });
+                    },
+                    choose(item) {
+                        if (!this.multiple) this.selected = [];
+                        if (!this.selected.some(i => i.id === item.id)) this.selected.push(item);
+                        this.open = false;
+                        this.term = '';
+                    },
+                })"
+                @click.away="open = false"
+            >
+                <template x-for="item in selected" :key="item.id">
+                    <input type="hidden" :name="name" :value="item.id">
+                </template>
+                <div class="tags-field">
+                    <template x-for="item in selected" :key="item.id">
+                        <span class="tag">
+                            <span x-text="item.text"></span>
+                            <a href="#" @click.prevent="selected = selected.filter(i => i.id !== item.id)">
+                                <i class="fa fa-times"></i>
+                            </a>
+                        </span>
+                    </template>
+                    <input %s placeholder="search ..." autocomplete="off"
+                        x-model="term"
+                        @input.debounce.300ms="load(1)"
+                        @focus="load(1)"
+                        @keydown.enter.prevent
+                    >
+                </div>
+                <ul x-show="open">
+                    <template x-for="item in results" :key="item.id">
+                        <li><a href="#" @click.prevent="choose(item)" x-text="item.text"></a></li>
+                    </template>
+                    <li x-show="more"><a href="#" @click.prevent="load(page + 1)">More ...</a></li>
+                    <li x-show="!results.length" class="muted">No results</li>
+                </ul>
+            </div>
+            """
+            % (escape(json.dumps(config)), widgets.html_params(**kwargs))
+        )
+
+
 class CheckboxInput(widgets.CheckboxInput):
     def __call__(self, field, **kwargs):
         kwargs.update({"class_": "checkbox-field"})
@@ -0,0 +1,112 @@
+import codecs
+import csv
+import json
+import typing
+
+from starlette.datastructures import ImmutableMultiDict
+
+
+class ImportRow(typing.NamedTuple):
+    line: int
+    data: typing.Optional[dict]
+    error: typing.Optional[str]
+
+
+class Importer:
+    """
+    The base class for the formats that can be imported. Files are read a
+    row at a time so an upload never needs to be held in memory.
+    """
+
+    label: str = ""
+    extension: str = ""
+    encoding_error: str = "Not valid UTF-8, save the file as UTF-8 and try again"
+
+    def read(self, file: typing.IO[bytes]) -> typing.Iterator[ImportRow]:
+        """ Yield each row of the file as a dict of values. """
+        raise NotImplementedError()
+
+    def get_text_stream(
+        self, file: typing.IO[bytes], invalid_lines: typing.Set[int]
+    ) -> typing.Iterator[str]:
+        """
+        Yield the lines of the file decoded as UTF-8. A line that can't be
+        decoded is yielded with the invalid bytes replaced and its number
+        added to `invalid_lines`, so it is reported as an error rather than
+        failing the whole import.
+        """
+
+        file.seek(0)
+        for line, data in enumerate(file, start=1):
+            if line == 1 and data.startswith(codecs.BOM_UTF8):
+                data = data[len(codecs.BOM_UTF8) :]
+            try:
+                yield data.decode("utf-8")
+            except UnicodeDecodeError:
+                invalid_lines.add(line)
+                yield data.decode("utf-8", "replace")
+
+    def get_formdata(self, data: dict) -> ImmutableMultiDict:
+        """ Return a row as form data to be validated by the admin's form. """
+
+        items = []
+        for key, value in data.items():
+            values = value if isinstance(value, list) else [value]
+            for value in values:
+                if value is None:
+                    continue
+                if isinstance(value, bool):
+                    value = "true" if value else "false"
+                elif isinstance(value, dict):
+                    value = json.dumps(value)
+                items.append((key, str(value)))
+        return ImmutableMultiDict(items)
+
+
+class CSVImporter(Importer):
+    """ Reads a csv file with a header row of field names. """
+
+    label = "CSV"
+    extension = "csv"
+
+    def read(self, file: typing.IO[bytes]) -> typing.Iterator[ImportRow]:
+        invalid_lines: typing.Set[int] = set()
+        reader = csv.DictReader(self.get_text_stream(file, invalid_lines))
+        # the field names can't be trusted so nothing else is read
+        if reader.fieldnames and invalid_lines:
+            yield ImportRow(line=1, data=None, error=self.encoding_error)
+            return
+        for data in reader:
+            if invalid_lines:
+                invalid_lines.clear()
+                yield ImportRow(
+                    line=reader.line_num, data=None, error=self.encoding_error
+                )
+                continue
+            yield ImportRow(line=reader.line_num, data=data, error=None)
+
+
+class NDJSONImporter(Importer):
+    """ Reads a file with a json object on each line. """
+
+    label = "JSON Lines"
+    extension = "ndjson"
+
+    def read(self, file: typing.IO[bytes]) -> typing.Iterator[ImportRow]:
+        invalid_lines: typing.Set[int] = set()
+        for line, text in enumerate(self.get_text_stream(file, invalid_lines), start=1):
+            if invalid_lines:
+                invalid_lines.clear()
+                yield ImportRow(line=line, data=None, error=self.encoding_error)
+                continue
+            if not text.strip():
+                continue
+            try:
+                data = json.loads(text)
+            except ValueError:
+                yield ImportRow(line=line, data=None, error="Invalid JSON")
+                continue
+            if not isinstance(data, dict):
+                yield ImportRow(line=line, data=None, error="Expected a JSON object")
+                continue
+            yield ImportRow(line=line, data=data, error=None)
@@ -0,0 +1,431 @@
+import base64
+import binascii
+import datetime
+import json
+import typing
+
+import sqlalchemy as sa
+from sqlalchemy import orm
+from starlette_core.exceptions import EmptyPage, InvalidPage, PageNotAnInteger
+from starlette_core.paginator import Paginator
+
+from .counts import CountStrategy, ExactCount
+
+
+class QueryPaginator(Paginator):
+    """
+    A paginator for sqlalchemy queries.
+
+    Rather than loading every row, each page is fetched using LIMIT/OFFSET
+    and the total is taken from the `count_strategy`, by default a separate
+    COUNT query. Lists, ie from `qs.all()`, are paginated by slicing.
+    """
+
+    object_list: typing.Union[orm.Query, list]
+
+    def __init__(
+        self,
+        object_list: typing.Union[orm.Query, list],
+        per_page: int,
+        count_strategy: typing.Optional[CountStrategy] = None,
+        count_key: typing.Hashable = None,
+    ):
+        super().__init__(object_list, per_page)
+        self.count_strategy = count_strategy or ExactCount()
+        self.count_key = count_key
+        self.count_is_estimate = False
+
+    @property
+    def count(self):
+        """Return the total number of objects, across all pages."""
+
+        if not isinstance(self.object_list, orm.Query):
+            return super().count
+
+        if self._count is None:
+            self._count, self.count_is_estimate = self.count_strategy.get_count(
+                self.object_list, self.count_key
+            )
+
+        return self._count
+
+    def validate_number(self, number):
+        """
+        Validate the given 1-based page number, when the count is an
+        estimate pages beyond it are allowed and will simply be empty.
+        """
+
+        if not (self.count and self.count_is_estimate):
+            return super().validate_number(number)
+
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+
+        return number
+
+    def page(self, number):
+        """Return a Page object for the given 1-based page number."""
+
+        if not isinstance(self.object_list, orm.Query):
+            return super().page(number)
+
+        number = self.validate_number(number)
+        offset = (number - 1) * self.per_page
+        object_list = self.object_list.offset(offset).limit(self.per_page).all()
+        return self._get_page(object_list, number, self)
+
+
+class KeysetPage:
+    def __init__(
+        self,
+        object_list: list,
+        paginator: typing.Union["KeysetPaginator", "ListKeysetPaginator"],
+        has_next: bool,
+        has_previous: bool,
+    ):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.has_next = has_next
+        self.has_previous = has_previous
+
+    def __repr__(self):
+        return f"<KeysetPage of {len(self)} objects>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    @property
+    def has_other_pages(self):
+        return self.has_previous or self.has_next
+
+    @property
+    def next_cursor(self) -> typing.Optional[str]:
+        if not self.has_next or not self.object_list:
+            return None
+        return self.paginator.get_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self) -> typing.Optional[str]:
+        if not self.has_previous or not self.object_list:
+            return None
+        return self.paginator.get_cursor(self.object_list[0])
+
+
+class KeysetPaginator:
+    """
+    A paginator for sqlalchemy queries that pages using the values of the
+    last/first row seen (order column, primary key) rather than an OFFSET,
+    so the cost of fetching a page does not grow the deeper you go.
+
+    When the order column is nullable NULLs are ordered after the other
+    values ascending, and before them descending.
+    """
+
+    def __init__(
+        self,
+        object_list: orm.Query,
+        per_page: int,
+        order_column: orm.attributes.InstrumentedAttribute,
+        id_column: orm.attributes.InstrumentedAttribute,
+        order_direction: str = "asc",
+    ):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.order_column = order_column
+        self.id_column = id_column
+        self.descending = order_direction == "desc"
+
+    @property
+    def nullable(self) -> bool:
+        columns = getattr(self.order_column.property, "columns", [])
+        return any(getattr(column, "nullable", True) for column in columns)
+
+    @property
+    def ordering_key(self) -> str:
+        direction = "desc" if self.descending else "asc"
+        return f"{self.order_column.key}:{direction}"
+
+    def get_cursor(self, obj) -> str:
+        """Return an opaque cursor that points at `obj`."""
+
+        values = [
+            self.ordering_key,
+            getattr(obj, self.order_column.key),
+            getattr(obj, self.id_column.key),
+        ]
+        data = json.dumps(values, default=str, separators=(",", ":"))
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> typing.Optional[tuple]:
+        """
+        Return the (order value, id) pointed at by the cursor or `None` when
+        the cursor was created under a different ordering.
+        """
+
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            key, value, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+            raise InvalidPage("That cursor is invalid")
+
+        if key != self.ordering_key:
+            return None
+
+        try:
+            return (
+                self._coerce(self.order_column, value),
+                self._coerce(self.id_column, id),
+            )
+        except (TypeError, ValueError):
+            raise InvalidPage("That cursor is invalid")
+
+    def _coerce(
+        self, column: orm.attributes.InstrumentedAttribute, value: typing.Any
+    ) -> typing.Any:
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return value
+
+        if value is None or isinstance(value, python_type):
+            return value
+        if python_type in (datetime.date, datetime.datetime, datetime.time):
+            return python_type.fromisoformat(value)  # type: ignore
+        return python_type(value)
+
+    def _seek(self, qs: orm.Query, values: tuple, forwards: bool) -> orm.Query:
+        value, id = values
+        greater = forwards != self.descending
+
+        if self.order_column.key == self.id_column.key:
+            return qs.filter(self.id_column > id if greater else self.id_column < id)
+
+        if self.nullable:
+            return qs.filter(self._seek_nullable(value, id, greater))
+
+        if greater:
+            return qs.filter(
+                sa.or_(
+                    self.order_column > value,
+                    sa.and_(self.order_column == value, self.id_column > id),
+                )
+            )
+        return qs.filter(
+            sa.or_(
+                self.order_column < value,
+                sa.and_(self.order_column == value, self.id_column < id),
+            )
+        )
+
+    def _seek_nullable(self, value: typing.Any, id: typing.Any, greater: bool):
+        # `NULL > x` is never true, so the NULLs ordered after the values are
+        # matched explicitly
+        column = self.order_column
+
+        if value is None:
+            if greater:
+                return sa.and_(column.is_(None), self.id_column > id)
+            return sa.or_(
+                column.isnot(None), sa.and_(column.is_(None), self.id_column < id)
+            )
+
+        if greater:
+            return sa.or_(
+                column > value,
+                sa.and_(column == value, self.id_column > id),
+                column.is_(None),
+            )
+        return sa.or_(column < value, sa.and_(column == value, self.id_column < id))
+
+    def _order(self, qs: orm.Query, forwards: bool) -> orm.Query:
+        if forwards != self.descending:
+            order = self.order_column.asc()
+            if self.nullable:
+                order = order.nullslast()
+        else:
+            order = self.order_column.desc()
+            if self.nullable:
+                order = order.nullsfirst()
+
+        columns = [order]
+        if self.order_column.key != self.id_column.key:
+            columns.append(
+                self.id_column.asc()
+                if forwards != self.descending
+                else self.id_column.desc()
+            )
+        return qs.order_by(None).order_by(*columns)
+
+    def get_page_query(
+        self, after: typing.Optional[str] = None, before: typing.Optional[str] = None
+    ) -> typing.Tuple[orm.Query, bool, bool]:
+        """
+        Return a tuple of (query, forwards, seeking) for the page following
+        the `after` cursor or preceding the `before` cursor. The query fetches
+        one extra row to know if there is anything beyond the page.
+        """
+
+        values = None
+        forwards = True
+
+        if after:
+            values = self.decode_cursor(after)
+        elif before:
+            values = self.decode_cursor(before)
+            forwards = values is None
+
+        qs = self._order(self.object_list, forwards)
+        if values is not None:
+            qs = self._seek(qs, values, forwards)
+
+        return qs.limit(self.per_page + 1), forwards, values is not None
+
+    def build_page(
+        self, object_list: list, forwards: bool, seeking: bool
+    ) -> KeysetPage:
+        """Return a KeysetPage for the rows fetched by `get_page_query`."""
+
+        has_more = len(object_list) > self.per_page
+        object_list = list(object_list[: self.per_page])
+
+        if not forwards:
+            object_list.reverse()
+            return KeysetPage(object_list, self, True, has_more)
+
+        return KeysetPage(object_list, self, has_more, seeking)
+
+    def page(
+        self, after: typing.Optional[str] = None, before: typing.Optional[str] = None
+    ) -> KeysetPage:
+        """
+        Return the page following the `after` cursor or preceding the
+        `before` cursor, the first page is returned when neither is given.
+        """
+
+        qs, forwards, seeking = self.get_page_query(after, before)
+        return self.build_page(qs.all(), forwards, seeking)
+
+
+class ListKeysetPaginator:
+    """
+    Keyset pagination for a list of objects already in the order they are
+    shown, ie from `BaseAdmin.get_list_objects`. The cursor is the id of
+    the last/first row seen so a page stays the same as rows are added
+    before it.
+    """
+
+    def __init__(
+        self,
+        object_list: typing.Sequence,
+        per_page: int,
+        get_id: typing.Callable[[typing.Any], typing.Any],
+    ):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.get_id = get_id
+
+    def get_cursor(self, obj) -> str:
+        """Return an opaque cursor that points at `obj`."""
+
+        data = json.dumps([self.get_id(obj)], default=str, separators=(",", ":"))
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str) -> str:
+        """Return the id pointed at by the cursor."""
+
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            (id,) = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+            raise InvalidPage("That cursor is invalid")
+        return str(id)
+
+    def get_index(self, cursor: str) -> typing.Optional[int]:
+        """
+        Return the index of the object pointed at by the cursor, or `None`
+        when it is no longer in the list.
+        """
+
+        id = self.decode_cursor(cursor)
+        for index, obj in enumerate(self.object_list):
+            if str(self.get_id(obj)) == id:
+                return index
+        return None
+
+    def page(
+        self, after: typing.Optional[str] = None, before: typing.Optional[str] = None
+    ) -> KeysetPage:
+        """
+        Return the page following the `after` cursor or preceding the
+        `before` cursor. The first page is returned when neither is given
+        or the object pointed at was removed.
+        """
+
+        start = 0
+        if after:
+            index = self.get_index(after)
+            if index is not None:
+                start = index + 1
+        elif before:
+            index = self.get_index(before)
+            if index is not None:
+                start = max(index - self.per_page, 0)
+
+        end = start + self.per_page
+        object_list = list(self.object_list[start:end])
+        return KeysetPage(object_list, self, end < len(self.object_list), start > 0)
+
+
+class AsyncQueryPaginator(Paginator):
+    """
+    A paginator for sqlalchemy `select()` statements executed with an
+    `AsyncSession`. As the count and page need awaiting, `fetch_count` must
+    be awaited before the paginator is used and pages are fetched with
+    `fetch_page`. Lists are paginated by slicing.
+    """
+
+    _count: typing.Optional[int]
+
+    def __init__(
+        self, object_list: typing.Union[sa.sql.Select, list], per_page: int, session
+    ):
+        super().__init__(object_list, per_page)
+        self.session = session
+
+    @property
+    def count(self):
+        """Return the total number of objects, across all pages."""
+
+        if self._count is None:
+            raise RuntimeError("`fetch_count` must be awaited before the count")
+        return self._count
+
+    async def fetch_count(self) -> int:
+        if not isinstance(self.object_list, sa.sql.Select):
+            self._count = len(self.object_list)
+        if self._count is None:
+            subquery = self.object_list.order_by(None).subquery()
+            stmt = sa.select(sa.func.count()).select_from(subquery)
+            self._count = await self.session.scalar(stmt)
+        return self._count
+
+    async def fetch_page(self, number):
+        """Return a Page object for the given 1-based page number."""
+
+        await self.fetch_count()
+        if not isinstance(self.object_list, sa.sql.Select):
+            return super().page(number)
+
+        number = self.validate_number(number)
+        offset = (number - 1) * self.per_page
+        stmt = self.object_list.offset(offset).limit(self.per_page)
+        result = await self.session.execute(stmt)
+        return self._get_page(result.scalars().all(), number, self)
@@ -0,0 +1,134 @@
+import typing
+
+from jinja2.utils import Markup, escape
+from starlette.routing import NoMatchFound
+
+TRUE_HTML = Markup('<i class="fa fa-check-circle c-olive"></i>')
+FALSE_HTML = Markup('<i class="fa fa-times-circle c-red"></i>')
+
+# stand ins for the id when reversing the edit url, one for convertors that
+# accept any string and one for those that only accept numbers
+URL_MARKERS = ("__id__", 987654321987654321)
+
+
+def format_value(value) -> Markup:
+    """ The default formatter, shows booleans as icons and empty values as `-`. """
+
+    if value is True:
+        return TRUE_HTML
+    if value is False:
+        return FALSE_HTML
+    return escape(value or "-")
+
+
+def get_accessor(name: str) -> typing.Callable[[typing.Any], typing.Any]:
+    """
+    Return a function getting the field `name` from an object, the same as
+    `BaseAdmin.get_field_value` but with the name split up front.
+    """
+
+    parts = tuple(name.split("."))
+
+    def accessor(obj):
+        value = obj
+        for part in parts:
+            if value is None:
+                return None
+            if isinstance(value, typing.Mapping):
+                value = value.get(part)
+                continue
+            try:
+                value = getattr(value, part)
+            except AttributeError:
+                try:
+                    value = value[part]
+                except (TypeError, LookupError):
+                    value = None
+        return value
+
+    return accessor
+
+
+def get_url_template(
+    request, name: str, param: str = "id"
+) -> typing.Optional[typing.Tuple[str, str]]:
+    """
+    Return the parts of the url before and after the `param` path param so
+    urls can be built by joining them with a value, or `None` when the
+    route can't be reversed with a stand in value.
+    """
+
+    for marker in URL_MARKERS:
+        try:
+            url = str(request.url_for(name, **{param: marker}))
+        except (AssertionError, NoMatchFound, ValueError):
+            continue
+        prefix, found, suffix = url.partition(str(marker))
+        if found:
+            return prefix, suffix
+    return None
+
+
+class RowRenderer:
+    """
+    Renders the rows of the list table, the accessor and formatter of each
+    column are looked up once rather than in the template for every cell.
+    """
+
+    def __init__(
+        self,
+        field_names: typing.Sequence[str],
+        formatters: typing.Optional[typing.Dict[str, typing.Callable]] = None,
+        get_value: typing.Optional[typing.Callable] = None,
+    ) -> None:
+        self.field_names = tuple(field_names)
+        self.formatters = dict(formatters or {})
+        self.get_value = get_value
+
+        def get_column_accessor(name):
+            if get_value is None:
+                return get_accessor(name)
+            return lambda obj: get_value(obj, name)
+
+        self.id_accessor = get_column_accessor("id")
+        self.columns = [
+            (get_column_accessor(name), self.formatters.get(name))
+            for name in self.field_names
+        ]
+
+    def bind(
+        self, request, edit_url_name: str, bulk: bool = False
+    ) -> typing.Callable[[typing.Any], Markup]:
+        """ Return a function rendering the `<tr>` of an object for the request. """
+
+        url_template = get_url_template(request, edit_url_name)
+        get_id = self.id_accessor
+        columns = self.columns
+
+        def render_row(obj) -> Markup:
+            object_id = get_id(obj)
+            cells = []
+            if bulk:
+                cells.append(
+                    '<td><input type="checkbox" name="ids" value="%s" '
+                    'form="bulk-form"></td>' % escape(object_id)
+                )
+            for index, (accessor, formatter) in enumerate(columns):
+                value = accessor(obj)
+                if index == 0:
+                    if formatter is not None:
+                        value = formatter(value)
+                    if url_template is None:
+                        url = request.url_for(edit_url_name, id=object_id)
+                    else:
+                        url = f"{url_template[0]}{object_id}{url_template[1]}"
+                    cells.append(
+                        '<td><a href="%s">%s</a></td>' % (escape(url), escape(value))
+                    )
+                elif formatter is not None:
+                    cells.append("<td>%s</td>" % escape(formatter(value)))
+                else:
+                    cells.append("<td>%s</td>" % format_value(value))
+            return Markup("<tr>%s</tr>" % "".join(cells))
+
+        return render_row
@@ -0,0 +1,199 @@
+import typing
+
+import sqlalchemy as sa
+from sqlalchemy import orm
+from sqlalchemy.dialects import postgresql
+
+
+class SearchBackend:
+    """
+    The base class for the ways of searching the columns in `search_fields`
+    of a model admin.
+    """
+
+    def search(
+        self, qs: orm.Query, model, fields: typing.Sequence[str], term: str
+    ) -> orm.Query:
+        """ Return the query filtered to the rows matching the term. """
+        raise NotImplementedError()
+
+    def get_ddl(self, model, fields: typing.Sequence[str]) -> list:
+        """
+        Return the statements that create the indexes, or other objects,
+        needed for the search to be fast. These can be used in migrations.
+        """
+
+        return []
+
+    def create_indexes(
+        self, connection: sa.engine.Connection, model, fields: typing.Sequence[str]
+    ) -> None:
+        """ Execute the statements from `get_ddl`. """
+
+        for statement in self.get_ddl(model, fields):
+            connection.execute(statement)
+
+    def get_column(self, model, name: str, bound: bool = True):
+        """
+        Return the column as text. When `bound = False` a column that is not
+        bound to the table is returned, which renders without the table name
+        as needed in index expressions.
+        """
+
+        column = getattr(model, name)
+        if not bound:
+            column = sa.column(name, column.type)
+        if isinstance(column.type, sa.String):
+            return column
+        return sa.cast(column, sa.Text)
+
+    def compile(self, expression) -> str:
+        return str(
+            expression.compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+        )
+
+
+class ILikeSearch(SearchBackend):
+    """
+    Matches rows where any of the fields contain the term using
+    `ILIKE '%term%'`. This needs no setup but can not use a btree index,
+    so will scan the whole table.
+    """
+
+    def search(
+        self, qs: orm.Query, model, fields: typing.Sequence[str], term: str
+    ) -> orm.Query:
+        pattern = f"%{term}%"
+        return qs.filter(
+            sa.or_(*[self.get_column(model, name).ilike(pattern) for name in fields])
+        )
+
+
+class TrigramSearch(ILikeSearch):
+    """
+    The same as `ILikeSearch` but with a trigram GIN index per field so
+    PostgreSQL can use the index for `ILIKE '%term%'`.
+
+    Requires the `pg_trgm` extension, which the DDL creates.
+    """
+
+    def get_ddl(self, model, fields: typing.Sequence[str]) -> list:
+        table = model.__table__.name
+        statements = [sa.DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")]
+        for name in fields:
+            column = self.compile(self.get_column(model, name, bound=False))
+            statements.append(
+                sa.DDL(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table}_{name}_trgm "
+                    f"ON {table} USING gin (({column}) gin_trgm_ops)"
+                )
+            )
+        return statements
+
+
+class PostgresFullTextSearch(SearchBackend):
+    """
+    Matches rows using PostgreSQL full text search over the fields,
+    `to_tsvector(config, fields) @@ plainto_tsquery(config, term)`.
+
+    The DDL creates a GIN index on the same expression, it is maintained
+    by PostgreSQL as rows change.
+    """
+
+    def __init__(self, config: str = "english") -> None:
+        self.config = config
+
+    def get_document(self, model, fields: typing.Sequence[str], bound: bool = True):
+        config = sa.literal_column(f"'{self.config}'::regconfig")
+        document = None
+        for name in fields:
+            value = sa.func.coalesce(
+                self.get_column(model, name, bound), sa.literal_column("''")
+            )
+            if document is None:
+                document = value
+            else:
+                document = document.op("||")(sa.literal_column("' '")).op("||")(value)
+        return sa.func.to_tsvector(config, document)
+
+    def search(
+        self, qs: orm.Query, model, fields: typing.Sequence[str], term: str
+    ) -> orm.Query:
+        config = sa.literal_column(f"'{self.config}'::regconfig")
+        query = sa.func.plainto_tsquery(config, term)
+        return qs.filter(self.get_document(model, fields).op("@@")(query))
+
+    def get_ddl(self, model, fields: typing.Sequence[str]) -> list:
+        table = model.__table__.name
+        document = self.compile(self.get_document(model, fields, bound=False))
+        return [
+            sa.DDL(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_search "
+                f"ON {table} USING gin ({document})"
+            )
+        ]
+
+
+class SQLiteFTS5Search(SearchBackend):
+    """
+    Matches rows using an SQLite FTS5 table named `<table>_fts` that
+    indexes the fields. Each word of the term is matched as a prefix.
+
+    The DDL creates the FTS5 table, populates it, and adds triggers that
+    keep it up to date as rows are inserted, updated and deleted.
+    """
+
+    def get_fts_table_name(self, model) -> str:
+        return f"{model.__table__.name}_fts"
+
+    def get_match(self, term: str) -> str:
+        words = [word.replace('"', '""') for word in term.split()]
+        return " ".join(f'"{word}"*' for word in words)
+
+    def search(
+        self, qs: orm.Query, model, fields: typing.Sequence[str], term: str
+    ) -> orm.Query:
+        match = self.get_match(term)
+        if not match:
+            return qs
+        fts = self.get_fts_table_name(model)
+        rowids = (
+            sa.select(sa.literal_column("rowid"))
+            .select_from(sa.table(fts))
+            .where(sa.literal_column(fts).op("MATCH")(match))
+        )
+        return qs.filter(model.id.in_(rowids))
+
+    def get_ddl(self, model, fields: typing.Sequence[str]) -> list:
+        table = model.__table__.name
+        fts = self.get_fts_table_name(model)
+        columns = ", ".join(fields)
+        new_values = ", ".join(f"new.{name}" for name in fields)
+        old_values = ", ".join(f"old.{name}" for name in fields)
+        return [
+            sa.DDL(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5"
+                f"({columns}, content='{table}', content_rowid='id')"
+            ),
+            sa.DDL(f"INSERT INTO {fts}({fts}) VALUES('rebuild')"),
+            sa.DDL(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); "
+                "END"
+            ),
+            sa.DDL(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {columns}) "
+                f"VALUES ('delete', old.id, {old_values}); "
+                "END"
+            ),
+            sa.DDL(
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN "
+                f"INSERT INTO {fts}({fts}, rowid, {columns}) "
+                f"VALUES ('delete', old.id, {old_values}); "
+                f"INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values}); "
+                "END"
+            ),
+        ]
@@ -1,41 +1,134 @@
+import asyncio
+import itertools
+import time
 import typing
+from concurrent.futures import ThreadPoolExecutor
 
 from starlette.authentication import has_required_scope
 from starlette.exceptions import HTTPException
+from starlette.responses import HTMLResponse
 from starlette.routing import NoMatchFound, Router
 
+from .concurrency import run_in_executor
 from .config import config
+from .exceptions import AlreadyRegistered
+from .widgets import RenderedWidget
+
+
+class NavigationLink(typing.NamedTuple):
+    name: str
+    # the path of the list view relative to the admin site
+    path: str
+
+
+class NavigationSection(typing.NamedTuple):
+    name: str
+    links: typing.Tuple[NavigationLink, ...]
 
 
 class AdminSite(Router):
     name: str
     permission_scopes: typing.Sequence[str]
-
-    _registry = []  # type: ignore
-    _widgets = []  # type: ignore
+    max_workers: typing.Optional[int]
 
     def __init__(
         self,
         name: str,
         permission_scopes: typing.Sequence[str] = [],
+        max_workers: typing.Optional[int] = None,
         **kwargs: typing.Any,
     ) -> None:
         self.name = name
         self.permission_scopes = permission_scopes
+        self.max_workers = max_workers
+        self._executor: typing.Optional[ThreadPoolExecutor] = None
+        self._registry: typing.List[typing.Any] = []
+        self._registry_by_mount_name: typing.Dict[str, typing.Any] = {}
+        self._registry_by_model: typing.Dict[typing.Any, typing.Any] = {}
+        self._widgets: typing.List[typing.Any] = []
+        self._sorted_registry: typing.List[typing.Any] = []
+        self._navigation: typing.Tuple[NavigationSection, ...] = ()
         super().__init__(**kwargs)
         # register the root view
         self.add_route("/", self.root, methods=["GET"], name="base")
+        # the view lazy widgets are fetched from
+        self.add_route(
+            "/widgets/{index:int}", self.widget, methods=["GET"], name="widget"
+        )
+
+    def register(self, model_admin):
+        """
+        Register an admin class on this site, returning the registered class.
+
+        When the class is already registered on another site a subclass
+        bound to this site is registered instead, so the same admin can be
+        used on many sites.
+        """
+
+        mount_name = model_admin.mount_name()
+        if mount_name in self._registry_by_mount_name:
+            raise AlreadyRegistered(f"{mount_name} is already registered")
+
+        # only a site set on this class, not one inherited from a registered parent
+        site = model_admin.__dict__.get("site")
+        if site is not None and site is not self:
+            model_admin = type(
+                model_admin.__name__,
+                (model_admin,),
+                {"__module__": model_admin.__module__},
+            )
 
-    def register(self, model_admin) -> None:
         #  set default attrs on the model admin
         model_admin.site = self
-        model_admin.permission_scopes = (
-            model_admin.permission_scopes or self.permission_scopes
-        )
-        #  append to the registry
+        #  add to the registry
         self._registry.append(model_admin)
+        self._registry_by_mount_name[mount_name] = model_admin
+        model_class = getattr(model_admin, "model_class", None)
+        if model_class is not None:
+            self._registry_by_model.setdefault(model_class, model_admin)
         # mount the urls
         self.mount(model_admin.mount_point(), model_admin.routes())
+        self.build_navigation()
+        return model_admin
+
+    def get_admin(self, mount_name: str):
+        """ Return the admin class registered with the mount name, or `None`. """
+
+        return self._registry_by_mount_name.get(mount_name)
+
+    def get_admin_for_model(self, model_class):
+        """
+        Return the admin class first registered for the model class, or
+        `None`.
+        """
+
+        return self._registry_by_model.get(model_class)
+
+    def build_navigation(self) -> None:
+        """
+        Build the sorted registry and the navigation shown in the menu and on
+        the root page, called whenever an admin is registered.
+        """
+
+        self._sorted_registry = sorted(
+            self._registry, key=lambda k: (k.section_name, k.collection_name)
+        )
+
+        sections = []
+        for section_name, admins in itertools.groupby(
+            self._sorted_registry, key=lambda k: k.section_name
+        ):
+            links = []
+            for admin in admins:
+                try:
+                    path = self.url_path_for(f"{admin.mount_name()}_list")
+                except NoMatchFound:
+                    # not mounted on this site
+                    continue
+                links.append(NavigationLink(admin.collection_name, path.lstrip("/")))
+            if links:
+                sections.append(NavigationSection(section_name, tuple(links)))
+        self._navigation = tuple(sections)
 
     def registry(
         self,
@@ -45,7 +138,7 @@ class AdminSite(Router):
         registered on this admin
         """
 
-        return sorted(self._registry, key=lambda k: (k.section_name, k.collection_name))
+        return self._sorted_registry
 
     def register_widget(self, widget) -> None:
         self._widgets.append(widget)
@@ -60,6 +153,92 @@ class AdminSite(Router):
 
         return self._widgets
 
+    async def render_widgets(self, request) -> typing.List[RenderedWidget]:
+        """
+        Render the widgets, each waits at most its `timeout` before a fallback
+        is rendered in its place. Coroutine widgets run concurrently while the
+        rest are fetched one after another in the thread pool. Lazy widgets
+        render a placeholder that fetches the widget once the page has loaded.
+        """
+
+        widgets = self.widgets()
+        blocking = [
+            index
+            for index, widget in enumerate(widgets)
+            if not widget.lazy
+            and not asyncio.iscoroutinefunction(widget.get_context)
+            and widget.get_cached_context() is None
+        ]
+        futures = dict(
+            zip(blocking, self.fetch_widget_contexts([widgets[i] for i in blocking]))
+        )
+
+        async def render(index, widget):
+            if widget.lazy:
+                url = request.url_for(f"{self.name}:widget", index=index)
+                return widget.render_placeholder(url)
+            return await widget.render_async(self, futures.get(index))
+
+        html = await asyncio.gather(
+            *[render(index, widget) for index, widget in enumerate(widgets)]
+        )
+        return [RenderedWidget(widget, h) for widget, h in zip(widgets, html)]
+
+    def fetch_widget_contexts(self, widgets) -> typing.List[asyncio.Future]:
+        """
+        Start fetching the context of each widget, returning a future for
+        each. The widgets are run one after another in a single thread pool
+        job so the request scoped database session is never used by two
+        threads at once. Widgets whose `timeout` has passed before they are
+        reached are skipped as their fallback is already rendered.
+        """
+
+        loop = asyncio.get_event_loop()
+        futures = [loop.create_future() for _ in widgets]
+
+        def resolve(future, context, error):
+            # the future is cancelled once the widget has timed out
+            if future.done():
+                return
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(context)
+
+        def fetch(start):
+            for widget, future in zip(widgets, futures):
+                if widget.timeout is not None and (
+                    time.monotonic() - start >= widget.timeout
+                ):
+                    continue
+                try:
+                    context, error = widget.get_context(), None
+                except Exception as e:
+                    context, error = None, e
+                loop.call_soon_threadsafe(resolve, future, context, error)
+
+        if widgets:
+            asyncio.ensure_future(self.run_in_threadpool(fetch, time.monotonic()))
+        return futures
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """
+        The thread pool used to run blocking work such as database queries,
+        limited to `max_workers` threads.
+        """
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix=f"{self.name}-admin"
+            )
+        return self._executor
+
+    async def run_in_threadpool(
+        self, func: typing.Callable, *args: typing.Any, **kwargs: typing.Any
+    ) -> typing.Any:
+        return await run_in_executor(self.executor, func, *args, **kwargs)
+
     def get_logout_url(self, request) -> str:
         try:
             return request.url_for("auth:logout")
@@ -71,6 +250,8 @@ class AdminSite(Router):
             "base_url_name": self.base_url_name,
             "is_auth_enabled": self.is_auth_enabled(request),
             "logout_url": self.get_logout_url(request),
+            "navigation": self._navigation,
+            "navigation_url": request.url_for(self.base_url_name),
             "registry": self.registry(),
             "request": request,
         }
@@ -90,6 +271,16 @@ class AdminSite(Router):
             raise HTTPException(403)
 
         context = self.get_context(request)
-        context.update({"widgets": self.widgets()})
+        context.update({"widgets": await self.render_widgets(request)})
         template = "starlette_admin/root.html"
         return config.templates.TemplateResponse(template, context)
+
+    async def widget(self, request):
+        if not has_required_scope(request, self.permission_scopes):
+            raise HTTPException(403)
+
+        widgets = self.widgets()
+        index = request.path_params["index"]
+        if index >= len(widgets):
+            raise HTTPException(404)
+        return HTMLResponse(await widgets[index].render_async(self))
@@ -0,0 +1,199 @@
+import hashlib
+import os
+import typing
+import weakref
+
+import jinja2
+from starlette.background import BackgroundTask
+from starlette.responses import StreamingResponse
+from starlette_core.messages import get_messages
+from starlette_core.templating import Jinja2Templates
+
+from .config import config
+
+_async_environments: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_template_digests: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+class MemoryBytecodeCache(jinja2.BytecodeCache):
+    """
+    Keeps compiled template bytecode in memory, shared by every environment
+    using the same instance, ie when templates are recreated in tests.
+    """
+
+    def __init__(self) -> None:
+        self._data: typing.Dict[str, bytes] = {}
+
+    def load_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+        code = self._data.get(bucket.key)
+        if code is not None:
+            bucket.bytecode_from_string(code)
+
+    def dump_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+        self._data[bucket.key] = bucket.bytecode_to_string()
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+def get_bytecode_cache(directory: typing.Optional[str] = None) -> jinja2.BytecodeCache:
+    """
+    Return a bytecode cache that writes compiled templates to files in the
+    directory, created if it doesn't exist, or one kept in memory when no
+    directory is given.
+    """
+
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        return jinja2.FileSystemBytecodeCache(directory)
+    return MemoryBytecodeCache()
+
+
+def configure_templates(
+    templates: typing.Optional[Jinja2Templates] = None,
+    bytecode_cache: typing.Optional[jinja2.BytecodeCache] = None,
+    auto_reload: typing.Optional[bool] = None,
+) -> Jinja2Templates:
+    """
+    Set the bytecode cache and auto reload of the templates, by default
+    `config.templates`. With `auto_reload = False` templates are not
+    checked for changes once loaded, as is usual in production.
+    """
+
+    templates = templates or config.templates
+    if bytecode_cache is not None:
+        templates.env.bytecode_cache = bytecode_cache
+        # templates already loaded would not be written to the new cache
+        if templates.env.cache is not None:
+            templates.env.cache.clear()
+    if auto_reload is not None:
+        templates.env.auto_reload = auto_reload
+    return templates
+
+
+def precompile_templates(
+    templates: typing.Optional[Jinja2Templates] = None,
+    prefix: str = "starlette_admin/",
+) -> typing.List[str]:
+    """
+    Load and compile every template whose name starts with the prefix so
+    the first request does not pay for it, ie on startup:
+
+        app.add_event_handler("startup", precompile_templates)
+
+    Returns the names of the templates compiled.
+    """
+
+    env = (templates or config.templates).env
+    names = env.list_templates(filter_func=lambda name: name.startswith(prefix))
+    for name in names:
+        env.get_template(name)
+    return names
+
+
+def get_templates_digest(templates: typing.Optional[Jinja2Templates] = None) -> str:
+    """
+    Return a hash of the source of every template, ie so pages cached by
+    browsers are rendered again once a template changes. It is computed
+    once, and again when a template file changes if `auto_reload` is on.
+    """
+
+    env = (templates or config.templates).env
+    cached = _template_digests.get(env)
+    if cached is not None:
+        digest, uptodates = cached
+        if not env.auto_reload or all(uptodate() for uptodate in uptodates):
+            return digest
+
+    sha = hashlib.sha1()
+    uptodates = []
+    try:
+        names = env.list_templates()
+    except TypeError:
+        # the loader can't list its templates
+        names = []
+    for name in names:
+        try:
+            source, _, uptodate = env.loader.get_source(env, name)
+        except (jinja2.TemplateNotFound, UnicodeDecodeError):
+            continue
+        sha.update(f"{name}\0{source}\0".encode())
+        if uptodate is not None:
+            uptodates.append(uptodate)
+
+    digest = sha.hexdigest()
+    _template_digests[env] = (digest, uptodates)
+    return digest
+
+
+def get_async_environment(
+    templates: typing.Optional[Jinja2Templates] = None,
+) -> jinja2.Environment:
+    """
+    Return an async version of the templates environment, sharing its
+    loader, globals and filters but with its own template cache as async
+    templates are compiled differently.
+    """
+
+    env = (templates or config.templates).env
+    if env not in _async_environments:
+        # the bytecode cache is keyed by template name and would return the
+        # sync bytecode, so the async environment does not use one
+        cache_size = getattr(env.cache, "capacity", 400)
+        async_env = env.overlay(cache_size=cache_size, bytecode_cache=None)
+        import jinja2.asyncsupport  # noqa
+
+        async_env.is_async = True
+        _async_environments[env] = async_env
+    return _async_environments[env]
+
+
+class StreamingTemplateResponse(StreamingResponse):
+    """
+    Renders a template with `generate_async`, sending the output as it is
+    produced rather than once the whole template has been rendered.
+    """
+
+    media_type = "text/html"
+
+    def __init__(
+        self,
+        name: str,
+        context: dict,
+        templates: typing.Optional[Jinja2Templates] = None,
+        status_code: int = 200,
+        headers: typing.Optional[typing.Mapping[str, str]] = None,
+        background: typing.Optional[BackgroundTask] = None,
+        chunk_size: int = 8192,
+    ) -> None:
+        if "request" not in context:
+            raise ValueError('context must include a "request" key')
+
+        # the session is saved when the response starts so messages are
+        # popped now rather than part way through rendering
+        messages = get_messages(context["request"])
+        context.setdefault("get_messages", lambda: messages)
+
+        self.template = get_async_environment(templates).get_template(name)
+        self.context = context
+        self.chunk_size = chunk_size
+        # starlette's arguments are annotated without `Optional`
+        super().__init__(
+            self.generate(), status_code=status_code, headers=dict(headers or {})
+        )
+        if background is not None:
+            self.background = background
+
+    async def generate(self) -> typing.AsyncIterator[str]:
+        """ Join the many small pieces jinja yields into larger chunks. """
+
+        chunk: typing.List[str] = []
+        size = 0
+        async for text in self.template.generate_async(self.context):
+            chunk.append(text)
+            size += len(text)
+            if size >= self.chunk_size:
+                yield "".join(chunk)
+                chunk, size = [], 0
+        if chunk:
+            yield "".join(chunk)
@@ -1,12 +1,28 @@
+import asyncio
+import typing
+
 from jinja2.utils import Markup
 
+from .cache import TTLCache
 from .config import config
 
 
 class BaseWidget:
     template = "starlette_admin/partials/widget.html"
+    placeholder_template = "starlette_admin/partials/widget_placeholder.html"
+    # when `True` the widget is fetched by the browser once the page has loaded
+    lazy: bool = False
+    # the seconds to wait for `get_context` before rendering the fallback
+    timeout: typing.Optional[float] = 5
+    # the seconds to cache the context for, `None` to disable caching
+    cache_ttl: typing.Optional[float] = None
 
     def get_context(self):
+        """
+        Return the context used to render the template, this can also be
+        defined as `async def get_context(self)`.
+        """
+
         return {
             "icon": "fa fa-cog",
             "value": 0,
@@ -14,6 +30,82 @@ class BaseWidget:
             "description": "Some useful description",
         }
 
+    def get_fallback_context(self):
+        """ Return the context rendered when `get_context` times out. """
+
+        return {
+            "icon": "fa fa-exclamation-triangle",
+            "value": "-",
+            "text": "Unavailable",
+            "description": "This took too long to load",
+        }
+
+    def get_placeholder_context(self):
+        """ Return the context rendered while a lazy widget is loading. """
+
+        return {
+            "icon": "fa fa-spinner fa-spin",
+            "value": "...",
+            "text": "Loading",
+            "description": "Loading",
+        }
+
+    @property
+    def cache(self) -> TTLCache:
+        if "_cache" not in self.__dict__:
+            self._cache = TTLCache(ttl=self.cache_ttl or 0, maxsize=1)
+        return self._cache
+
+    def get_cached_context(self):
+        return self.cache.get("context") if self.cache_ttl else None
+
+    async def get_context_async(self, site, future=None):
+        """
+        Return the context from `get_context`, awaiting it if it is a
+        coroutine function, otherwise running it in the site thread pool.
+        When `future` is given the context is already being fetched, ie by
+        `AdminSite.fetch_widget_contexts`, so it is awaited instead.
+        """
+
+        context = self.get_cached_context()
+        if context is not None:
+            return context
+
+        if future is not None:
+            context = await future
+        elif asyncio.iscoroutinefunction(self.get_context):
+            context = await self.get_context()
+        else:
+            context = await site.run_in_threadpool(self.get_context)
+
+        if self.cache_ttl:
+            self.cache.set("context", context)
+        return context
+
+    async def render_async(self, site, future=None) -> Markup:
+        try:
+            context = await asyncio.wait_for(
+                self.get_context_async(site, future), timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            context = self.get_fallback_context()
+        template = config.templates.get_template(self.template)
+        return Markup(template.render(context))
+
+    def render_placeholder(self, url: str) -> Markup:
+        """ Render the placeholder that fetches a lazy widget from the url. """
+
+        template = config.templates.get_template(self.placeholder_template)
+        return Markup(
+            template.render(
+                {
+                    "url": url,
+                    "template": self.template,
+                    **self.get_placeholder_context(),
+                }
+            )
+        )
+
     def render(self):
         template = config.templates.get_template(self.template)
         return template.render(self.get_context())
@@ -21,3 +113,8 @@ class BaseWidget:
     @property
     def html(self):
         return Markup(self.render())
+
+
+class RenderedWidget(typing.NamedTuple):
+    widget: BaseWidget
+    html: Markup